@@ -7,9 +7,13 @@ class Vertex:
            
 class DirectedGraph:
 
-        def __init__(self):
+        def __init__(self, reverseIndex=True):
             self._graph = {}
-            self._vertexObjects = set()
+            # _pred[v] is the set of vertices with an edge to v, it is only
+            # kept when reverseIndex is True
+            self._pred = {} if reverseIndex else None
+            self._vertexObjects = {}
+            self._csr = None
 
 
         def display(self):
@@ -46,7 +50,10 @@ class DirectedGraph:
                 print("Vertex with this name already present in the graph")
             else:
                 self._graph[name] = set()
-                self._vertexObjects.add( Vertex(name) )
+                if self._pred is not None:
+                    self._pred[name] = set()
+                self._vertexObjects[name] = Vertex(name)
+                self._csr = None
 
 
         def removeVertex(self,name):
@@ -54,17 +61,19 @@ class DirectedGraph:
                print("Vertex not present in the graph")
                return 
 
-            self._graph.pop(name)
-                   
-            for u in self._graph:
-               if name in self._graph[u]: 
+            if self._pred is not None:
+               for v in self._graph[name]:
+                  self._pred[v].discard(name)
+               for u in self._pred.pop(name):
                   self._graph[u].remove(name)
+            else:
+               for u in self._graph:
+                  if name in self._graph[u]:
+                     self._graph[u].remove(name)
 
-            for vertex in self._vertexObjects:
-               if name == vertex.name:
-                   v = vertex
-                   break
-            self._vertexObjects.remove(v)
+            self._graph.pop(name)
+            del self._vertexObjects[name]
+            self._csr = None
             
 
         def insertEdge(self, s1, s2):
@@ -78,13 +87,19 @@ class DirectedGraph:
     	        print("Edge already present in the graph") 
             else:  
                 self._graph[s1].add(s2)   
+                if self._pred is not None:
+                    self._pred[s2].add(s1)
+                self._csr = None
         
 
         def removeEdge(self, s1,s2):
-             if s2 not in self._graph[s1]:
+             if s1 not in self._graph or s2 not in self._graph[s1]:
                 print("Edge not present in the graph")
              else:	  
                 self._graph[s1].remove(s2)
+                if self._pred is not None:
+                    self._pred[s2].remove(s1)
+                self._csr = None
 
 
         def isAdjacent(self, s1, s2):
@@ -109,17 +124,84 @@ class DirectedGraph:
                 print("Vertex not present in the graph")
                 return
 
+            if self._pred is not None:
+                return len(self._pred[s])
+
             ind = 0
             for u in self._graph:
-                ind += list(self._graph[u]).count(s)
-                   
+                if s in self._graph[u]:
+                   ind += 1
             return ind
 
+
+        def predecessors(self, s):
+            if s not in self._graph:
+                print("Vertex not present in the graph")
+                return
+
+            if self._pred is not None:
+                return list(self._pred[s])
+            return [u for u in self._graph if s in self._graph[u]]
+
+
+        def csr(self):
+            # Snapshot of the graph as (names, offsets, sources, outdegrees)
+            # over the vertex indices in the order of vertices(). The
+            # in-edges of v come from sources[offsets[v]:offsets[v+1]].
+            # It is rebuilt after the graph changes
+            if self._csr is None:
+                names = list(self._graph)
+                index = { name : i for i, name in enumerate(names) }
+                inEdges = [ [] for name in names ]
+                for u in self._graph:
+                    for v in self._graph[u]:
+                        inEdges[index[v]].append(index[u])
+                offsets = [0]
+                sources = []
+                for row in inEdges:
+                    sources.extend(row)
+                    offsets.append(len(sources))
+                outdegrees = [ len(self._graph[name]) for name in names ]
+                self._csr = (names, offsets, sources, outdegrees)
+            return self._csr
+
+
+        def pageRank(self, damping=0.85, tolerance=1e-10, maxIterations=100, start=None):
+            # Power iteration r = (1-d)/n + d (M r + dangling/n), where M
+            # moves the rank of each vertex evenly along its out-edges and
+            # the rank of vertices with no out-edges is spread over all
+            # vertices. Stops when the L1 change is below tolerance. start
+            # is a dict of ranks from an earlier run, vertices missing from
+            # it start at 1/n, so after a small change to the graph it
+            # converges in a few iterations. Returns a dict name -> rank
+            names, offsets, sources, outdegrees = self.csr()
+            n = len(names)
+            if n == 0:
+                return {}
+
+            if start is None:
+                rank = [1.0 / n] * n
+            else:
+                rank = [ start.get(name, 1.0 / n) for name in names ]
+                total = sum(rank)
+                rank = [ r / total for r in rank ]
+
+            for iteration in range(maxIterations):
+                share = [ r / d if d else 0.0 for r, d in zip(rank, outdegrees) ]
+                dangling = sum( r for r, d in zip(rank, outdegrees) if d == 0 )
+                base = (1 - damping) / n + damping * dangling / n
+                newRank = [ base + damping * sum( [ share[u] for u in sources[offsets[v]:offsets[v+1]] ] )
+                            for v in range(n) ]
+                change = sum( abs(a - b) for a, b in zip(newRank, rank) )
+                rank = newRank
+                if change < tolerance:
+                    break
+
+            return dict(zip(names, rank))
+
+
         def _getVertex(self,s):
-            for vertex in self._vertexObjects:
-                if s == vertex.name:
-                   return vertex
-            return None
+            return self._vertexObjects.get(s)
 
 
 if __name__ == '__main__':
@@ -146,7 +228,8 @@ if __name__ == '__main__':
       print("5.Delete an edge")
       print("6.Display indegree and outdegree of a vertex")
       print("7.Check if there is an edge between two vertices")
-      print("8.Quit")
+      print("8.PageRank of the vertices")
+      print("9.Quit")
         
       option = int(input("Enter your choice : " ))
 
@@ -186,6 +269,9 @@ if __name__ == '__main__':
           else:
               print("There is no edge from " , s1 , " to " , s2)
       elif option == 8:
+          for name, rank in sorted(g.pageRank().items(), key = lambda item: -item[1]):
+              print(name, round(rank, 4))
+      elif option == 9:
           break
       else:
           print("Wrong option")
@@ -7,9 +7,12 @@ class Vertex:
 
 class DirectedWeightedGraph:
 
-        def __init__(self):
+        def __init__(self, reverseIndex=True):
             self._graph = {}
-            self._vertexObjects = set()
+            # _pred[v] is the set of vertices with an edge to v, it is only
+            # kept when reverseIndex is True
+            self._pred = {} if reverseIndex else None
+            self._vertexObjects = {}
 
 
         def display(self):
@@ -36,18 +39,19 @@ class DirectedWeightedGraph:
         def edges(self):  
            edgesList = []
            for u in self._graph:
-               for v,w in self._graph[u]:  
+               for v,w in self._graph[u].items():  
                   edgesList.append((u,v,w))
            return edgesList
 
 
         def insertVertex(self,name):
-
             if name in self._graph:
                 print("Vertex with this name already present in the graph")
             else:
-                self._graph[name] = set()
-                self._vertexObjects.add( Vertex(name) )
+                self._graph[name] = {}
+                if self._pred is not None:
+                    self._pred[name] = set()
+                self._vertexObjects[name] = Vertex(name)
 
 
         def removeVertex(self,name):
@@ -55,18 +59,18 @@ class DirectedWeightedGraph:
                print("Vertex not present in the graph")
                return 
 
+            if self._pred is not None:
+               for v in self._graph[name]:
+                  self._pred[v].discard(name)
+               for u in self._pred.pop(name):
+                  self._graph[u].pop(name)
+            else:
+               for u in self._graph:
+                  if name in self._graph[u]:
+                     self._graph[u].pop(name)
+
             self._graph.pop(name)
-                   
-            for u in self._graph:
-               for i,t in enumerate( self._graph[u] ):
-                  if t[0] == name:
-                    self._graph[u].pop(i)
-
-            for vertex in self._vertexObjects:
-               if name == vertex.name:
-                   v = vertex
-                   break
-            self._vertexObjects.remove(v)
+            del self._vertexObjects[name]
             
 
         def insertEdge(self, s1, s2,w):
@@ -76,19 +80,21 @@ class DirectedWeightedGraph:
                 print("End vertex not present in the graph, first insert the end vertex")
             elif s1 == s2:
                 print("Not a valid edge")
-            elif s2 in ( t[0] for t in self._graph[s1] ):
+            elif s2 in self._graph[s1]:
     	        print("Edge already present in the graph") 
             else:  
-                self._graph[s1].add((s2,w))   
+                self._graph[s1][s2] = w
+                if self._pred is not None:
+                    self._pred[s2].add(s1)
         
 
         def removeEdge(self, s1,s2):
-             for u in self._graph:
-               for t in self._graph[u] :
-                  if u==s1 and t[0] == s2:
-                    self._graph[u].remove(t)
-                    return
-             print("Edge not present in the graph")
+             if s1 not in self._graph or s2 not in self._graph[s1]:
+                print("Edge not present in the graph")
+             else:
+                del self._graph[s1][s2]
+                if self._pred is not None:
+                    self._pred[s2].remove(s1)
 
 
         def isAdjacent(self, s1, s2):
@@ -98,7 +104,7 @@ class DirectedWeightedGraph:
             if s2 not in self._graph:
                print("End vertex not present in the graph")
                return False
-            return s2 in ( t[0] for t in self._graph[s1] )
+            return s2 in self._graph[s1]  
       
         
         def outdegree(self, s):
@@ -113,19 +119,28 @@ class DirectedWeightedGraph:
                 print("Vertex not present in the graph")
                 return
 
+            if self._pred is not None:
+                return len(self._pred[s])
+
             ind = 0
             for u in self._graph:
-              for t in self._graph[u]:
-                 if t[0] == s:
+                if s in self._graph[u]:
                    ind += 1
-                   
             return ind
 
+
+        def predecessors(self, s):
+            if s not in self._graph:
+                print("Vertex not present in the graph")
+                return
+
+            if self._pred is not None:
+                return list(self._pred[s])
+            return [u for u in self._graph if s in self._graph[u]]
+
+
         def _getVertex(self,s):
-            for vertex in self._vertexObjects:
-                if s == vertex.name:
-                   return vertex
-            return None
+            return self._vertexObjects.get(s)
 
 
 if __name__ == '__main__':
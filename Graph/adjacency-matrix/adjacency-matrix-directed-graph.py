@@ -10,17 +10,20 @@ class DirectedGraph:
            self._adj = [  [0 for column in range(size)]  for row in range(size) ]
            self._n = 0
            self._vertexList = []
+           self._index = {}
+           self._removed = 0
            
 
         def display(self):
-            for i in range(self._n):
-                for j in range(self._n):
+            live = [u for u in range(self._n) if self._vertexList[u] is not None]
+            for i in live:
+                for j in live:
                    print( self._adj[i][j], end =' ')
                 print()
 
 
         def numVertices(self):
-            return self._n
+            return self._n - self._removed
 
 
         def numEdges(self):
@@ -33,7 +36,7 @@ class DirectedGraph:
 
 
         def vertices(self):
-            return [vertex.name for vertex in self._vertexList]
+            return [vertex.name for vertex in self._vertexList if vertex is not None]
 
 
         def edges(self):
@@ -46,23 +49,37 @@ class DirectedGraph:
 
 
         def _getIndex(self,s):
-            index = 0
-            for name in (vertex.name for vertex in self._vertexList):
-                if s == name:
-                   return index
-                index += 1
-            return None
+            return self._index.get(s)
+
+
+        def _grow(self):
+             # Double the capacity so that a run of insertions costs
+             # amortized O(V) per vertex
+             capacity = max(1, 2*len(self._adj))
+             for row in self._adj:
+                  row.extend( [0] * (capacity - len(row)) )
+             for i in range(capacity - len(self._adj)):
+                  self._adj.append( [0] * capacity )
 
 
         def insertVertex(self,name):
-            if name in (vertex.name for vertex in self._vertexList): 
+            if name in self._index:
                 print("Vertex with this name already present in the graph")
                 return
                 
+            if self._n == len(self._adj):
+                self._grow()
+
+            self._index[name] = self._n
             self._vertexList.append( Vertex(name) )  
             self._n += 1
 
 
+        def insertVertices(self, names):
+            for name in names:
+                self.insertVertex(name)
+
+
         def insertEdge(self, s1, s2):
             u = self._getIndex(s1)
             v = self._getIndex(s2)
@@ -78,6 +95,11 @@ class DirectedGraph:
                 self._adj[u][v] = 1
 
 
+        def insertEdges(self, edges):
+            for s1, s2 in edges:
+                self.insertEdge(s1, s2)
+
+
         def removeEdge(self, s1, s2):
              u = self._getIndex(s1)
              v = self._getIndex(s2)
@@ -96,16 +118,37 @@ class DirectedGraph:
              if u is None:
                 print("Vertex not present in the graph")
                 return
-        
-             self._adj.pop(u)
 
+             # Leave a tombstone in slot u instead of shifting the matrix,
+             # the slots are reclaimed by _compact once half of them are dead
              for i in range(self._n):
-                  self._adj[i].pop(u)
-                  
-             self._vertexList.pop(u)
-             self._n -= 1
-               
-   
+                  self._adj[u][i] = 0
+                  self._adj[i][u] = 0
+
+             self._vertexList[u] = None
+             del self._index[name]
+             self._removed += 1
+
+             if 2*self._removed > self._n:
+                  self._compact()
+
+
+        def _compact(self):
+             live = [u for u in range(self._n) if self._vertexList[u] is not None]
+             capacity = len(self._adj)
+             adj = [  [0 for column in range(capacity)]  for row in range(capacity) ]
+             for i, u in enumerate(live):
+                  row = self._adj[u]
+                  for j, v in enumerate(live):
+                       adj[i][j] = row[v]
+
+             self._adj = adj
+             self._vertexList = [self._vertexList[u] for u in live]
+             self._index = { vertex.name : i for i, vertex in enumerate(self._vertexList) }
+             self._n = len(live)
+             self._removed = 0
+
+
         def isAdjacent(self, s1, s2):
             u = self._getIndex(s1)
             v = self._getIndex(s2)
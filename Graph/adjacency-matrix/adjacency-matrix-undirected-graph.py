@@ -1,9 +1,27 @@
 
 
+import sys
+
+
 class Vertex:
         def __init__(self, name):
            self.name = name
 
+
+def _bits(row):
+    # Indices of the set bits of an int bitset, lowest first
+    while row:
+        low = row & -row
+        yield low.bit_length() - 1
+        row ^= low
+
+
+try:
+    _popcount = int.bit_count
+except AttributeError:          # Python before 3.10
+    def _popcount(row):
+        return bin(row).count("1")
+
           
 class UndirectedGraph:
 
@@ -11,17 +29,20 @@ class UndirectedGraph:
            self._adj = [  [0 for column in range(size)]  for row in range(size) ]
            self._n = 0
            self._vertexList = []
+           self._index = {}
+           self._removed = 0
            
 
         def display(self):
-            for i in range(self._n):
-                for j in range(self._n):
+            live = [u for u in range(self._n) if self._vertexList[u] is not None]
+            for i in live:
+                for j in live:
                    print( self._adj[i][j], end =' ')
                 print()
 
 
         def numVertices(self):
-            return self._n
+            return self._n - self._removed
 
 
         def numEdges(self):  
@@ -34,7 +55,7 @@ class UndirectedGraph:
 
 
         def vertices(self):
-            return [vertex.name for vertex in self._vertexList]
+            return [vertex.name for vertex in self._vertexList if vertex is not None]
 
 
         def edges(self):  
@@ -47,23 +68,37 @@ class UndirectedGraph:
 
 
         def _getIndex(self,s):
-            index = 0
-            for name in (vertex.name for vertex in self._vertexList):
-                if s == name:
-                   return index
-                index += 1
-            return None
+            return self._index.get(s)
+
+
+        def _grow(self):
+             # Double the capacity so that a run of insertions costs
+             # amortized O(V) per vertex
+             capacity = max(1, 2*len(self._adj))
+             for row in self._adj:
+                  row.extend( [0] * (capacity - len(row)) )
+             for i in range(capacity - len(self._adj)):
+                  self._adj.append( [0] * capacity )
 
 
         def insertVertex(self,name):
-            if name in (vertex.name for vertex in self._vertexList): ######## 
+            if name in self._index:
                 print("Vertex with this name already present in the graph")
                 return
                 
+            if self._n == len(self._adj):
+                self._grow()
+
+            self._index[name] = self._n
             self._vertexList.append( Vertex(name) )  
             self._n += 1
 
 
+        def insertVertices(self, names):
+            for name in names:
+                self.insertVertex(name)
+
+
         def insertEdge(self, s1, s2):
             u = self._getIndex(s1)
             v = self._getIndex(s2)
@@ -80,6 +115,12 @@ class UndirectedGraph:
                 self._adj[v][u] = 1
                 
         
+
+        def insertEdges(self, edges):
+            for s1, s2 in edges:
+                self.insertEdge(s1, s2)
+
+
         def removeEdge(self, s1,s2):
              u = self._getIndex(s1)
              v = self._getIndex(s2)
@@ -99,14 +140,35 @@ class UndirectedGraph:
              if u is None:
                 print("Vertex not present in the graph")
                 return
-        
-             self._adj.pop(u)
 
+             # Leave a tombstone in slot u instead of shifting the matrix,
+             # the slots are reclaimed by _compact once half of them are dead
              for i in range(self._n):
-                  self._adj[i].pop(u)
-                  
-             self._vertexList.pop(u)
-             self._n -= 1
+                  self._adj[u][i] = 0
+                  self._adj[i][u] = 0
+
+             self._vertexList[u] = None
+             del self._index[name]
+             self._removed += 1
+
+             if 2*self._removed > self._n:
+                  self._compact()
+
+
+        def _compact(self):
+             live = [u for u in range(self._n) if self._vertexList[u] is not None]
+             capacity = len(self._adj)
+             adj = [  [0 for column in range(capacity)]  for row in range(capacity) ]
+             for i, u in enumerate(live):
+                  row = self._adj[u]
+                  for j, v in enumerate(live):
+                       adj[i][j] = row[v]
+
+             self._adj = adj
+             self._vertexList = [self._vertexList[u] for u in live]
+             self._index = { vertex.name : i for i, vertex in enumerate(self._vertexList) }
+             self._n = len(live)
+             self._removed = 0
 
 
         def isAdjacent(self, s1, s2):
@@ -134,9 +196,225 @@ class UndirectedGraph:
             return deg
 
 
+class BitsetUndirectedGraph:
+
+        # Same interface as UndirectedGraph with each row of the adjacency
+        # matrix packed into an int bitset, one bit per cell instead of a
+        # list slot and an int object. Degrees are popcounts and common
+        # neighbours one AND of two rows. With triangular the matrix is
+        # upper triangular, row u only holds the neighbours v > u, so every
+        # edge is stored once at the cost of an O(V) column scan to list
+        # the neighbours below u. A 100k vertex dense graph takes about
+        # 1.25 GB, or half that triangular
+        def __init__(self, size=20, triangular=False):
+           self._rows = []
+           self._n = 0
+           self._vertexList = []
+           self._index = {}
+           self._removed = 0
+           self._triangular = triangular
+
+
+        def display(self):
+            live = [u for u in range(self._n) if self._vertexList[u] is not None]
+            for i in live:
+                for j in live:
+                   print( 1 if self._hasEdge(i, j) else 0, end =' ')
+                print()
+
+
+        def numVertices(self):
+            return self._n - self._removed
+
+
+        def numEdges(self):
+            e = sum( _popcount(row) for row in self._rows )
+            return e if self._triangular else e // 2
+
+
+        def vertices(self):
+            return [vertex.name for vertex in self._vertexList if vertex is not None]
+
+
+        def edges(self):
+            edges = []
+            for i in range(self._n):
+                for j in _bits(self._row(i) & ((1 << i) - 1)):
+                    edges.append( (self._vertexList[i].name, self._vertexList[j].name) )
+            return edges
+
+
+        def _getIndex(self,s):
+            return self._index.get(s)
+
+
+        def _hasEdge(self, u, v):
+            if self._triangular and v < u:
+                u, v = v, u
+            return (self._rows[u] >> v) & 1 == 1
+
+
+        def _row(self, u):
+            # Bitset of all the neighbours of u
+            if not self._triangular:
+                return self._rows[u]
+            row = self._rows[u]
+            bit = 1 << u
+            for w in range(u):
+                if self._rows[w] & bit:
+                    row |= 1 << w
+            return row
+
+
+        def insertVertex(self,name):
+            if name in self._index:
+                print("Vertex with this name already present in the graph")
+                return
+
+            self._index[name] = self._n
+            self._vertexList.append( Vertex(name) )
+            self._rows.append(0)
+            self._n += 1
+
+
+        def insertVertices(self, names):
+            for name in names:
+                self.insertVertex(name)
+
+
+        def insertEdge(self, s1, s2):
+            u = self._getIndex(s1)
+            v = self._getIndex(s2)
+            if u is None:
+                print("First vertex not present in the graph")
+            elif v is None:
+                print("Second vertex not present in the graph")
+            elif u == v:
+                print("Not a valid edge")
+            elif self._hasEdge(u, v):
+                print("Edge already present in the graph")
+            elif self._triangular:
+                self._rows[min(u,v)] |= 1 << max(u,v)
+            else:
+                self._rows[u] |= 1 << v
+                self._rows[v] |= 1 << u
+
+
+        def insertEdges(self, edges):
+            for s1, s2 in edges:
+                self.insertEdge(s1, s2)
+
+
+        def removeEdge(self, s1,s2):
+             u = self._getIndex(s1)
+             v = self._getIndex(s2)
+             if u is None:
+                print("First vertex not present in the graph")
+             elif v is None:
+                print("Second vertex not present in the graph")
+             elif not self._hasEdge(u, v):
+                print("Edge not present in the graph")
+             elif self._triangular:
+                self._rows[min(u,v)] &= ~(1 << max(u,v))
+             else:
+                self._rows[u] &= ~(1 << v)
+                self._rows[v] &= ~(1 << u)
+
+
+        def removeVertex(self,name):
+             u = self._getIndex(name)
+             if u is None:
+                print("Vertex not present in the graph")
+                return
+
+             # Tombstone as in UndirectedGraph, _compact renumbers the bits
+             # once half of the slots are dead
+             mask = ~(1 << u)
+             for v in _bits(self._row(u)):
+                  self._rows[v] &= mask
+             self._rows[u] = 0
+
+             self._vertexList[u] = None
+             del self._index[name]
+             self._removed += 1
+
+             if 2*self._removed > self._n:
+                  self._compact()
+
+
+        def _compact(self):
+             live = [u for u in range(self._n) if self._vertexList[u] is not None]
+             newIndex = { u : i for i, u in enumerate(live) }
+             rows = []
+             for u in live:
+                  row = 0
+                  for v in _bits(self._rows[u]):
+                       row |= 1 << newIndex[v]
+                  rows.append(row)
+
+             self._rows = rows
+             self._vertexList = [self._vertexList[u] for u in live]
+             self._index = { vertex.name : i for i, vertex in enumerate(self._vertexList) }
+             self._n = len(live)
+             self._removed = 0
+
+
+        def isAdjacent(self, s1, s2):
+            u = self._getIndex(s1)
+            v = self._getIndex(s2)
+            if u is None:
+                print("First vertex not present in the graph")
+                return False
+            elif v is None:
+                print("Second vertex not present in the graph")
+                return False
+            return self._hasEdge(u, v)
+
+
+        def degree(self,s):
+            u = self._getIndex(s)
+            if u is None:
+               print("Vertex not present in the graph")
+               return
+            return _popcount(self._row(u))
+
+
+        def neighbours(self, s):
+            u = self._getIndex(s)
+            if u is None:
+               print("Vertex not present in the graph")
+               return
+            return [self._vertexList[v].name for v in _bits(self._row(u))]
+
+
+        def commonNeighbours(self, s1, s2):
+            u = self._getIndex(s1)
+            v = self._getIndex(s2)
+            if u is None or v is None:
+               print("Vertex not present in the graph")
+               return
+            return [self._vertexList[w].name for w in _bits(self._row(u) & self._row(v))]
+
+
+        def countTriangles(self):
+            # Every triangle u < v < w is counted once, from its edge (u,v),
+            # as a bit of the AND of the upper parts of rows u and v
+            upper = self._rows
+            if not self._triangular:
+                upper = [ row >> (u+1) << (u+1) for u, row in enumerate(self._rows) ]
+            triangles = 0
+            for u in range(self._n):
+                for v in _bits(upper[u]):
+                    triangles += _popcount(upper[u] & upper[v])
+            return triangles
+
+
 if __name__ == '__main__':
 
-  g = UndirectedGraph() 
+  if "--bits" in sys.argv:
+      g = BitsetUndirectedGraph(triangular = "--triangular" in sys.argv)
+  else:
+      g = UndirectedGraph() 
 
   g.insertVertex("AA")
   g.insertVertex("BB")
@@ -0,0 +1,222 @@
+from multiprocessing import Pool, RawArray, cpu_count
+from sys import maxsize as INFINITY
+
+from graph_core import Graph, fromEdges
+from graph_algorithms import dijkstra
+
+
+# All pairs shortest path distances of a directed weighted graph. The graph
+# is any of the weighted graph classes (DirectedWeightedGraph, graph_core),
+# only its vertices() and edges() methods are used. Negative weights are
+# allowed, a negative cycle raises ValueError.
+#
+# floydWarshall is the blocked Floyd-Warshall : the matrix is cut into
+# blockSize x blockSize tiles and for every diagonal block kb the tile
+# (kb,kb) is closed first, then the tiles of row and column kb, then all the
+# others. The tiles of one phase only read tiles that are already final in
+# it, so they are spread over a process pool that updates the matrix in
+# shared memory. It suits dense graphs, the matrix takes 8 n^2 bytes.
+#
+# johnson reweights the edges with Bellman-Ford potentials so that they are
+# all non-negative and runs the Dijkstra of graph_algorithms from every
+# vertex, the sources split over a process pool. It suits sparse graphs
+
+
+class DistanceMatrix:
+
+        def __init__(self, names, rows):
+            self._names = names
+            self._index = { name : i for i, name in enumerate(names) }
+            self._rows = rows
+
+
+        def vertices(self):
+            return self._names
+
+
+        def matrix(self):
+            # rows[u][v] is the distance from vertex u to vertex v, INFINITY
+            # when there is no path
+            return self._rows
+
+
+        def distance(self, s1, s2):
+            u = self._index.get(s1)
+            v = self._index.get(s2)
+            if u is None:
+               print("Start vertex not present in the graph")
+               return
+            if v is None:
+               print("End vertex not present in the graph")
+               return
+            return self._rows[u][v]
+
+
+        def display(self):
+            for row in self._rows:
+                print( *[ "-" if d == INFINITY else d for d in row ] )
+            print()
+
+
+def _indexEdges(graph):
+    # Names in graph order and a dict (u,v) -> w keeping the lightest of any
+    # parallel edges, self loops are left out
+    names = list(graph.vertices())
+    index = { name : i for i, name in enumerate(names) }
+    weights = {}
+    for s1, s2, w in graph.edges():
+        u = index[s1]
+        v = index[s2]
+        if u != v and w < weights.get( (u,v), INFINITY ):
+            weights[(u,v)] = w
+    return names, weights
+
+
+def _toRows(values, n, integral):
+    rows = []
+    for i in range(n):
+        row = values[i*n : (i+1)*n]
+        rows.append( [ INFINITY if d == float("inf") else (int(d) if integral else d) for d in row ] )
+    return rows
+
+
+_shared = None
+
+def _initWorker(matrix, n):
+    global _shared
+    _shared = (matrix, n)
+
+
+def _relaxBlock(bounds):
+    # d[i][j] = min(d[i][j], d[i][k] + d[k][j]) for k, i and j in the given
+    # ranges, k outermost. Row k of the block is read again for every k so
+    # the updates made for the earlier k are seen
+    k0, k1, i0, i1, j0, j1 = bounds
+    d, n = _shared
+    width = j1 - j0
+    for k in range(k0, k1):
+        rowk = d[k*n + j0 : k*n + j1]
+        for i in range(i0, i1):
+            dik = d[i*n + k]
+            if dik == float("inf"):
+                continue
+            a = i*n + j0
+            d[a : a + width] = [ x if x <= dik + y else dik + y for x, y in zip(d[a : a + width], rowk) ]
+
+
+def floydWarshall(graph, blockSize=64, processes=None):
+    names, weights = _indexEdges(graph)
+    n = len(names)
+    integral = all( isinstance(w, int) for w in weights.values() )
+
+    d = RawArray("d", n*n)
+    for i in range(n):
+        d[i*n : (i+1)*n] = [float("inf")] * n
+        d[i*n + i] = 0
+    for (u,v), w in weights.items():
+        d[u*n + v] = w
+
+    blocks = [ (lo, min(n, lo + blockSize)) for lo in range(0, n, blockSize) ]
+
+    def phases(kb):
+        k0, k1 = blocks[kb]
+        yield [ (k0, k1, k0, k1, k0, k1) ]
+        yield ( [ (k0, k1, k0, k1, j0, j1) for jb, (j0, j1) in enumerate(blocks) if jb != kb ] +
+                [ (k0, k1, i0, i1, k0, k1) for ib, (i0, i1) in enumerate(blocks) if ib != kb ] )
+        # One task per strip of rows, the tile in column kb is final and
+        # relaxing it again leaves it unchanged
+        yield [ (k0, k1, i0, i1, 0, n) for ib, (i0, i1) in enumerate(blocks) if ib != kb ]
+
+    processes = processes or cpu_count()
+    if processes == 1:
+        _initWorker(d, n)
+        for kb in range(len(blocks)):
+            for tasks in phases(kb):
+                for task in tasks:
+                    _relaxBlock(task)
+    else:
+        with Pool(processes, _initWorker, (d, n)) as pool:
+            for kb in range(len(blocks)):
+                for tasks in phases(kb):
+                    pool.map(_relaxBlock, tasks)
+
+    if any( d[i*n + i] < 0 for i in range(n) ):
+        raise ValueError("Graph has a negative cycle")
+    return DistanceMatrix( names, _toRows(d, n, integral) )
+
+
+def _potentials(n, weights):
+    # Bellman-Ford from a virtual vertex with a 0 edge to every vertex,
+    # h[u] + w(u,v) - h[v] is then never negative
+    h = [0] * n
+    for rounds in range(n + 1):
+        changed = False
+        for (u,v), w in weights.items():
+            if h[u] + w < h[v]:
+                h[v] = h[u] + w
+                changed = True
+        if not changed:
+            return h
+    raise ValueError("Graph has a negative cycle")
+
+
+_johnsonShared = None
+
+def _initJohnson(g, h):
+    global _johnsonShared
+    _johnsonShared = (g, h)
+
+
+def _johnsonRow(s):
+    g, h = _johnsonShared
+    distance, predecessor = dijkstra(g, s)
+    return [ INFINITY if d == INFINITY else d - h[s] + h[v] for v, d in enumerate(distance) ]
+
+
+def johnson(graph, processes=None):
+    names, weights = _indexEdges(graph)
+    n = len(names)
+    h = _potentials(n, weights)
+
+    # Vertex ids of the reweighted graph are the indices in names
+    g = Graph()
+    g.insertVertices(names)
+    for (u,v), w in weights.items():
+        g.insertEdge( names[u], names[v], w + h[u] - h[v] )
+
+    processes = processes or cpu_count()
+    if processes == 1:
+        _initJohnson(g, h)
+        rows = [ _johnsonRow(s) for s in range(n) ]
+    else:
+        with Pool(processes, _initJohnson, (g, h)) as pool:
+            rows = pool.map(_johnsonRow, range(n), chunksize = max(1, n // (4 * processes)))
+    return DistanceMatrix(names, rows)
+
+
+def allPairsShortestPaths(graph, mode="floyd", blockSize=64, processes=None):
+    if mode == "floyd":
+        return floydWarshall(graph, blockSize, processes)
+    if mode == "johnson":
+        return johnson(graph, processes)
+    raise ValueError("Unknown mode " + repr(mode))
+
+
+if __name__ == '__main__':
+
+  g = fromEdges( [ ("Zero", "Three", 2), ("Zero", "One", 5), ("Zero", "Four", 8), ("One", "Four", 2),
+                   ("Two", "One", 3), ("Two", "Five", 4), ("Three", "Four", 7), ("Three", "Six", 8),
+                   ("Four", "Five", 9), ("Four", "Seven", 4), ("Five", "One", 6), ("Six", "Seven", 9),
+                   ("Seven", "Three", 5), ("Seven", "Five", 3), ("Seven", "Eight", 5), ("Eight", "Five", 3) ] )
+
+  fw = allPairsShortestPaths(g, "floyd", blockSize=4, processes=2)
+  print("Floyd-Warshall distances :")
+  fw.display()
+
+  jo = allPairsShortestPaths(g, "johnson", processes=2)
+  print("Johnson distances :")
+  jo.display()
+  print("Zero to Eight :", fw.distance("Zero", "Eight"), jo.distance("Zero", "Eight"))
+
+  g.insertEdge("Five", "Zero", -4)
+  print("Five to Eight with a negative edge :", allPairsShortestPaths(g, "johnson", processes=1).distance("Five", "Eight"))
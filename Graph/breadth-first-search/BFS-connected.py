@@ -1,8 +1,7 @@
 
 
-INITIAL = 0   
-WAITING = 1
-VISITED = 2
+from collections import deque
+from multiprocessing import Pool, RawArray, cpu_count
 
         
 class Vertex:
@@ -12,10 +11,18 @@ class Vertex:
           
 class UndirectedGraph:
 
-        def __init__(self,size=20):
+        def __init__(self,size=20,incremental=False):
            self._adj = [  [0 for column in range(size)]  for row in range(size) ]
            self._n = 0
            self._vertexList = []
+           self._index = {}
+           # With incremental a union-find over the vertices is updated by
+           # every insertEdge. Deletions cannot be undone in a union-find, so
+           # they set _parent to None and it is rebuilt by the next query
+           self._incremental = incremental
+           self._parent = [] if incremental else None
+           self._rank = [] if incremental else None
+           self._components = 0
            
 
         def display(self):
@@ -52,21 +59,39 @@ class UndirectedGraph:
 
 
         def _getIndex(self,s):
-            index = 0
-            for name in (vertex.name for vertex in self._vertexList):
-                if s == name:
-                   return index
-                index += 1
-            return None
+            return self._index.get(s)
+
+
+        def _grow(self):
+             # Double the capacity so that a run of insertions costs
+             # amortized O(V) per vertex
+             capacity = max(1, 2*len(self._adj))
+             for row in self._adj:
+                  row.extend( [0] * (capacity - len(row)) )
+             for i in range(capacity - len(self._adj)):
+                  self._adj.append( [0] * capacity )
 
 
         def insertVertex(self,name):
-            if name in (vertex.name for vertex in self._vertexList): ######## 
+            if name in self._index:
                 print("Vertex with this name already present in the graph")
                 return
                 
+            if self._n == len(self._adj):
+                self._grow()
+
+            self._index[name] = self._n
             self._vertexList.append( Vertex(name) )  
             self._n += 1
+            if self._parent is not None:
+                self._parent.append(self._n - 1)
+                self._rank.append(0)
+                self._components += 1
+
+
+        def insertVertices(self, names):
+            for name in names:
+                self.insertVertex(name)
 
 
         def removeVertex(self,name):
@@ -77,13 +102,15 @@ class UndirectedGraph:
         
              self._adj.pop(u)
 
-             for i in range(self._n):
-                  self._adj[i].pop(u)
+             for row in self._adj:
+                  row.pop(u)
                   
-             for i,vertex in enumerate(self._vertexList):
-               if name == vertex.name:
-                   self._vertexList.pop(i)
+             self._vertexList.pop(u)
+             del self._index[name]
+             for i in range(u, self._n-1):
+                  self._index[self._vertexList[i].name] = i
              self._n -= 1
+             self._parent = None
                
     
         def insertEdge(self, s1, s2):
@@ -100,8 +127,16 @@ class UndirectedGraph:
             else:  
                 self._adj[u][v] = 1
                 self._adj[v][u] = 1
+                if self._parent is not None:
+                    self._union(u, v)
                 
         
+
+        def insertEdges(self, edges):
+            for s1, s2 in edges:
+                self.insertEdge(s1, s2)
+
+
         def removeEdge(self, s1,s2):
              u = self._getIndex(s1)
              v = self._getIndex(s2)
@@ -114,6 +149,7 @@ class UndirectedGraph:
              else:        
                 self._adj[u][v] = 0
                 self._adj[v][u] = 0
+                self._parent = None
 
 
         def isAdjacent(self, s1, s2):
@@ -141,46 +177,219 @@ class UndirectedGraph:
                      deg += 1
             return deg
          
-        def _bfsC(self, v, cN):
-            from queue import Queue
-            qu = Queue()
-            qu.put(v)
-            self._vertexList[v].state = WAITING
-
-            while qu.qsize() != 0:
-               v = qu.get()
-               self._vertexList[v].state = VISITED
-               self._vertexList[v].componentNumber = cN
-
-               for i in range(self._n):
-                  if self._adj[v][i]!=0 and self._vertexList[i].state == INITIAL: 
-                     qu.put(i)
-                     self._vertexList[i].state = WAITING
+        def _csr(self):
+            offsets = [0]
+            targets = []
+            for u in range(self._n):
+                row = self._adj[u]
+                for v in range(self._n):
+                    if row[v] != 0:
+                        targets.append(v)
+                offsets.append(len(targets))
+            return offsets, targets
+
+
+        def componentLabels(self, mode="bfs", processes=None):
+            # Component id of every vertex, numbered from 0 in the order the
+            # components are first met. mode is "bfs", "unionfind" or
+            # "propagation", the last one runs label propagation on a pool of
+            # worker processes
+            if mode == "bfs":
+                return self._bfsLabels()
+            if mode == "unionfind":
+                names, labels = streamingComponents( self.edges(), self.vertices() )
+                return labels
+            if mode == "propagation":
+                offsets, targets = self._csr()
+                return labelPropagation(offsets, targets, processes)
+            print("Unknown mode", mode)
+
+
+        def _bfsLabels(self):
+            label = [None] * self._n
+            cN = 0
+            for s in range(self._n):
+                if label[s] is not None:
+                    continue
+                label[s] = cN
+                qu = deque([s])
+                while qu:
+                    v = qu.popleft()
+                    row = self._adj[v]
+                    for i in range(self._n):
+                        if row[i] != 0 and label[i] is None:
+                            label[i] = cN
+                            qu.append(i)
+                cN += 1
+            return label
+
+ 
+        def _find(self, v):
+            parent = self._parent
+            while parent[v] != v:
+                parent[v] = parent[parent[v]]
+                v = parent[v]
+            return v
+
+
+        def _union(self, u, v):
+            r1 = self._find(u)
+            r2 = self._find(v)
+            if r1 == r2:
+                return
+            if self._rank[r1] < self._rank[r2]:
+                r1, r2 = r2, r1
+            self._parent[r2] = r1
+            if self._rank[r1] == self._rank[r2]:
+                self._rank[r1] += 1
+            self._components -= 1
+
+
+        def _unionFind(self):
+            if self._parent is None:
+                self._parent = list(range(self._n))
+                self._rank = [0] * self._n
+                self._components = self._n
+                for u in range(self._n):
+                    for v in range(u):
+                        if self._adj[u][v] != 0:
+                            self._union(u, v)
+
+
+        def areConnected(self, s1, s2):
+            u = self._getIndex(s1)
+            v = self._getIndex(s2)
+            if u is None:
+                print("First vertex not present in the graph")
+                return False
+            elif v is None:
+                print("Second vertex not present in the graph")
+                return False
+
+            if not self._incremental:
+                label = self._bfsLabels()
+                return label[u] == label[v]
+            self._unionFind()
+            return self._find(u) == self._find(v)
+
+
+        def numComponents(self):
+            if not self._incremental:
+                return len(set(self._bfsLabels()))
+            self._unionFind()
+            return self._components
 
  
         def isConnected(self):
-            
-             for v in range(self._n):
-                 self._vertexList[v].state = INITIAL
-             
-             cN = 1
-             
-             self._bfsC(0,cN)
-                 
-             for v in range(self._n):
-                if self._vertexList[v].state == INITIAL:
-                    cN += 1
-                    self._bfsC(v,cN)
-
-             if cN == 1:
+             label = self.componentLabels()
+             cN = max(label) + 1 if label else 0
+
+             if cN <= 1:
                   print("Graph is connected")
                   return True
              else:
                   print("Graph is not connected, it has", cN , "connected components")
                   for v in range(self._n):
-                       print(self._vertexList[v].name , "  " , self._vertexList[v].componentNumber)
+                       print(self._vertexList[v].name , "  " , label[v] + 1)
                   return False
 
+
+def streamingComponents(edges, vertices=()):
+    # Union-find over a stream of (s1, s2) pairs, so edge lists that would
+    # never fit in a matrix can be labelled in one pass. Vertex names are
+    # interned to integer ids as they are first seen. Returns the names in
+    # id order and their component ids
+    index = {}
+    names = []
+    parent = []
+    rank = []
+
+    def intern(name):
+        u = index.get(name)
+        if u is None:
+            u = index[name] = len(names)
+            names.append(name)
+            parent.append(u)
+            rank.append(0)
+        return u
+
+    def find(v):
+        while parent[v] != v:
+            parent[v] = parent[parent[v]]
+            v = parent[v]
+        return v
+
+    for name in vertices:
+        intern(name)
+
+    for edge in edges:
+        r1 = find( intern(edge[0]) )
+        r2 = find( intern(edge[1]) )
+        if r1 != r2:
+            if rank[r1] < rank[r2]:
+                r1, r2 = r2, r1
+            parent[r2] = r1
+            if rank[r1] == rank[r2]:
+                rank[r1] += 1
+
+    return names, _relabel( [find(v) for v in range(len(names))] )
+
+
+def _relabel(roots):
+    # Renumbers representative ids to 0, 1, 2 ... in order of appearance
+    ids = {}
+    return [ ids.setdefault(r, len(ids)) for r in roots ]
+
+
+_shared = None
+
+def _initWorker(offsets, targets, labels):
+    global _shared
+    _shared = (offsets, targets, labels)
+
+
+def _propagateRange(bounds):
+    # Each vertex takes the smallest label among itself and its neighbours.
+    # Only the owner of a range writes to it, other workers may read a stale
+    # value but labels only ever decrease, so the result is the same
+    offsets, targets, labels = _shared
+    changed = False
+    for v in range(bounds[0], bounds[1]):
+        best = labels[v]
+        for i in range(offsets[v], offsets[v+1]):
+            if labels[targets[i]] < best:
+                best = labels[targets[i]]
+        if best < labels[v]:
+            labels[v] = best
+            changed = True
+    return changed
+
+
+def labelPropagation(offsets, targets, processes=None):
+    # Min-label propagation over an undirected CSR graph. The CSR arrays and
+    # the labels live in shared memory, each worker process owns a range of
+    # vertices and the rounds stop once no label changes
+    n = len(offsets) - 1
+    offsets = RawArray("q", offsets)
+    targets = RawArray("q", targets)
+    labels = RawArray("q", range(n))
+
+    processes = processes or cpu_count()
+    step = max(1, -(-n // (4 * processes)))
+    ranges = [ (lo, min(n, lo + step)) for lo in range(0, n, step) ]
+
+    if processes == 1:
+        _initWorker(offsets, targets, labels)
+        while any( [_propagateRange(r) for r in ranges] ):
+            pass
+    else:
+        with Pool(processes, _initWorker, (offsets, targets, labels)) as pool:
+            while any( pool.map(_propagateRange, ranges) ):
+                pass
+
+    return _relabel( list(labels) )
+
+
 if __name__ == '__main__':
 
         g1 = UndirectedGraph() 
@@ -254,5 +463,14 @@ if __name__ == '__main__':
 
         g2.isConnected()
 
-
-   
+        print("Component ids :", g2.componentLabels())
+        print("Component ids by label propagation :", g2.componentLabels("propagation", 2))
+        print("Component ids of an edge stream :", streamingComponents( [("a","b"), ("c","d"), ("b","e")] ))
+
+        g3 = UndirectedGraph(incremental=True)
+        g3.insertVertices( ["Zero", "One", "Two", "Three"] )
+        g3.insertEdge("Zero", "One")
+        g3.insertEdge("Two", "Three")
+        print("Components :", g3.numComponents(), " Zero and Three connected :", g3.areConnected("Zero", "Three"))
+        g3.insertEdge("One", "Two")
+        print("Components :", g3.numComponents(), " Zero and Three connected :", g3.areConnected("Zero", "Three"))
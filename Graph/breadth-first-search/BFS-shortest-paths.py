@@ -1,11 +1,20 @@
   
 
 from sys import maxsize as INFINITY
+from collections import deque
 
 INITIAL = 0
 WAITING = 1
 VISITED = 2
 
+def _bits(row):
+    # Indices of the set bits of an int bitset, lowest first
+    while row:
+        low = row & -row
+        yield low.bit_length() - 1
+        row ^= low
+
+
 class Vertex:
         def __init__(self, name):
            self.name = name
@@ -16,6 +25,8 @@ class DirectedGraph:
            self._adj = [  [0 for column in range(size)]  for row in range(size) ]
            self._n = 0
            self._vertexList = []
+           self._index = {}
+           self._bitsets = None
            
 
         def display(self):
@@ -52,21 +63,36 @@ class DirectedGraph:
 
 
         def _getIndex(self,s):
-            index = 0
-            for name in (vertex.name for vertex in self._vertexList):
-                if s == name:
-                   return index
-                index += 1
-            return None
+            return self._index.get(s)
+
+
+        def _grow(self):
+             # Double the capacity so that a run of insertions costs
+             # amortized O(V) per vertex
+             capacity = max(1, 2*len(self._adj))
+             for row in self._adj:
+                  row.extend( [0] * (capacity - len(row)) )
+             for i in range(capacity - len(self._adj)):
+                  self._adj.append( [0] * capacity )
 
 
         def insertVertex(self,name):
-            if name in (vertex.name for vertex in self._vertexList): ######## 
+            if name in self._index:
                 print("Vertex with this name already present in the graph")
                 return
                 
+            if self._n == len(self._adj):
+                self._grow()
+
+            self._index[name] = self._n
             self._vertexList.append( Vertex(name) )  
             self._n += 1
+            self._bitsets = None
+
+
+        def insertVertices(self, names):
+            for name in names:
+                self.insertVertex(name)
 
 
         def removeVertex(self,name):
@@ -77,13 +103,15 @@ class DirectedGraph:
         
              self._adj.pop(u)
 
-             for i in range(self._n):
-                  self._adj[i].pop(u)
+             for row in self._adj:
+                  row.pop(u)
                   
-             for i,vertex in enumerate(self._vertexList):
-               if name == vertex.name:
-                   self._vertexList.pop(i)
+             self._vertexList.pop(u)
+             del self._index[name]
+             for i in range(u, self._n-1):
+                  self._index[self._vertexList[i].name] = i
              self._n -= 1
+             self._bitsets = None
                
     
         def insertEdge(self, s1, s2):
@@ -99,8 +127,15 @@ class DirectedGraph:
                 print("Edge already present in the graph") 
             else:  
                 self._adj[u][v] = 1
+                self._bitsets = None
                 
         
+
+        def insertEdges(self, edges):
+            for s1, s2 in edges:
+                self.insertEdge(s1, s2)
+
+
         def removeEdge(self, s1,s2):
              u = self._getIndex(s1)
              v = self._getIndex(s2)
@@ -112,6 +147,7 @@ class DirectedGraph:
                 print("Edge not present in the graph")
              else:        
                 self._adj[u][v] = 0
+                self._bitsets = None
 
 
         def isAdjacent(self, s1, s2):
@@ -165,60 +201,175 @@ class DirectedGraph:
              self._bfs(u)
 
            
+        def _bitsetsOf(self):
+            # out[v] and inc[v] are int bitsets of the successors and the
+            # predecessors of v, rebuilt only after the graph changes
+            if self._bitsets is None:
+                out = [0] * self._n
+                inc = [0] * self._n
+                for v in range(self._n):
+                    row = self._adj[v]
+                    for i in range(self._n):
+                        if row[i] != 0:
+                            out[v] |= 1 << i
+                            inc[i] |= 1 << v
+                outdeg = [bin(row).count("1") for row in out]
+                succ = [list(_bits(row)) for row in out]
+                self._bitsets = (out, inc, outdeg, succ)
+            return self._bitsets
+
+
+        def shortestPathTree(self, s, alpha=14, beta=24):
+            # Direction optimizing BFS. Each level is expanded either top down,
+            # from the frontier along out-edges, or bottom up, where every
+            # unvisited vertex looks for a parent among its in-edges. Bottom up
+            # is used while the frontier has more out-edges than the
+            # unvisited part divided by alpha and switches back once the
+            # frontier holds fewer than n/beta vertices
+            out, inc, outdeg, succ = self._bitsetsOf()
+            distance = [INFINITY] * self._n
+            predecessor = [None] * self._n
+            distance[s] = 0
+
+            frontier = 1 << s
+            visited = 1 << s
+            unvisitedEdges = sum(outdeg) - outdeg[s]
+            frontierEdges = outdeg[s]
+            frontierSize = 1
+            bottomUp = False
+            level = 0
+
+            while frontier:
+                level += 1
+                if bottomUp:
+                    bottomUp = frontierSize >= self._n // beta
+                else:
+                    bottomUp = frontierEdges > unvisitedEdges // alpha
+
+                nextFrontier = 0
+                if bottomUp:
+                    for w in _bits( ~visited & ((1 << self._n) - 1) ):
+                        parents = inc[w] & frontier
+                        if parents:
+                            predecessor[w] = (parents & -parents).bit_length() - 1
+                            distance[w] = level
+                            nextFrontier |= 1 << w
+                else:
+                    for v in _bits(frontier):
+                        new = out[v] & ~visited & ~nextFrontier
+                        for w in _bits(new):
+                            predecessor[w] = v
+                            distance[w] = level
+                        nextFrontier |= new
+
+                visited |= nextFrontier
+                frontier = nextFrontier
+                frontierSize = 0
+                frontierEdges = 0
+                for w in _bits(frontier):
+                    frontierSize += 1
+                    frontierEdges += outdeg[w]
+                unvisitedEdges -= frontierEdges
+
+            return distance, predecessor
+
+
+        def _multiSourceDistances(self, sources):
+            # MS-BFS, bit k of seen[v] is set once source k has reached v and
+            # bit k of visit[v] when v is in the frontier of source k. One
+            # pass over the edges advances the frontiers of all the sources
+            succ = self._bitsetsOf()[3]
+            distance = [ [INFINITY] * self._n for k in sources ]
+            seen = [0] * self._n
+            visit = [0] * self._n
+            for k, s in enumerate(sources):
+                seen[s] |= 1 << k
+                visit[s] |= 1 << k
+                distance[k][s] = 0
+
+            active = [v for v in range(self._n) if visit[v]]
+            level = 0
+            while active:
+                level += 1
+                visitNext = [0] * self._n
+                for v in active:
+                    mask = visit[v]
+                    for w in succ[v]:
+                        visitNext[w] |= mask
+
+                active = []
+                for w in range(self._n):
+                    new = visitNext[w] & ~seen[w]
+                    if new:
+                        seen[w] |= new
+                        for k in _bits(new):
+                            distance[k][w] = level
+                        active.append(w)
+                    visitNext[w] = new
+                visit = visitNext
+            return distance
+
+
+        def batchShortestDistances(self, names, batchSize=64):
+            # Distance lists for many sources, up to batchSize sources share
+            # one traversal. Results are kept out of the Vertex objects so
+            # several batches can run at the same time from different threads
+            sources = []
+            for s in names:
+                u = self._getIndex(s)
+                if u is None:
+                    print("Vertex", s, "not present in the graph")
+                    return
+                sources.append(u)
+
+            distances = []
+            for i in range(0, len(sources), batchSize):
+                distances.extend( self._multiSourceDistances(sources[i:i+batchSize]) )
+            return distances
+
+
         def findShortestPath(self,s):
             u = self._getIndex(s)
             if u is None:
                 print("Vertex not present in the graph")
                 return
         
-            for v in range(self._n):
-                self._vertexList[v].state = INITIAL
-                self._vertexList[v].predecessor = None
-                self._vertexList[v].distance = INFINITY
-                           
-            self._bfs(u)
+            distance, predecessor = self.shortestPathTree(u)
                    
             for v in range(self._n):
-              if self._vertexList[v].distance == INFINITY:
+              if distance[v] == INFINITY:
                  print("No path from vertex ", s, " to vertex ", self._vertexList[v].name)
               else:     
                  print("Shortest distance from vertex ", s , " to vertex ", self._vertexList[v].name,\
-                        "is",  self._vertexList[v].distance)
+                        "is",  distance[v])
                                                                                      
-                 path = [None] * self._n
-                 count = 0
-                 x = v
+                 path = []
                  y = v
                  while  y != None:
-                    count += 1
-                    path[count] = y
-                    x = self._vertexList[y].predecessor
-                    y = x
+                    path.append(y)
+                    y = predecessor[y]
 
                  print("Shortest Path is : ", end = " ")
-                 i = count
-                 while i > 1:
+                 for i in range(len(path)-1, 0, -1):
                      print( self._vertexList[ path[i] ].name, "->",end="")
-                     i -= 1
-                 print(self._vertexList[path[i]].name )
+                 print(self._vertexList[path[0]].name )
 
 
         def _bfs(self, v):
-            from queue import Queue
-            qu = Queue()
-            qu.put(v)
+            qu = deque()
+            qu.append(v)
             self._vertexList[v].state = WAITING
             self._vertexList[v].distance = 0
             self._vertexList[v].predecessor = None
 
-            while qu.qsize() != 0:
-               v = qu.get()
+            while len(qu) != 0:
+               v = qu.popleft()
                print(self._vertexList[v].name, " ")
                self._vertexList[v].state = VISITED   
 
                for i in range(self._n):
                   if self._adj[v][i]!=0 and self._vertexList[i].state == INITIAL: 
-                     qu.put(i)
+                     qu.append(i)
                      self._vertexList[i].state = WAITING
                      self._vertexList[i].predecessor = v
                      self._vertexList[i].distance = self._vertexList[v].distance + 1
@@ -276,3 +427,7 @@ if __name__ == '__main__':
 
  
   g.findShortestPath("Two")
+
+  print()
+  for s, distance in zip( ["Zero", "Two", "Five"], g.batchShortestDistances(["Zero", "Two", "Five"]) ):
+      print("Distances from", s, ":", [d if d != INFINITY else None for d in distance])
@@ -16,6 +16,7 @@ class UndirectedGraph:
            self._adj = [  [0 for column in range(size)]  for row in range(size) ]
            self._n = 0
            self._vertexList = []
+           self._index = {}
            
 
         def display(self):
@@ -52,23 +53,37 @@ class UndirectedGraph:
 
 
         def _getIndex(self,s):
-            index = 0
-            for name in (vertex.name for vertex in self._vertexList):
-                if s == name:
-                   return index
-                index += 1
-            return None
+            return self._index.get(s)
+
+
+        def _grow(self):
+             # Double the capacity so that a run of insertions costs
+             # amortized O(V) per vertex
+             capacity = max(1, 2*len(self._adj))
+             for row in self._adj:
+                  row.extend( [0] * (capacity - len(row)) )
+             for i in range(capacity - len(self._adj)):
+                  self._adj.append( [0] * capacity )
 
 
         def insertVertex(self,name):
-            if name in (vertex.name for vertex in self._vertexList): ######## 
+            if name in self._index:
                 print("Vertex with this name already present in the graph")
                 return
                 
+            if self._n == len(self._adj):
+                self._grow()
+
+            self._index[name] = self._n
             self._vertexList.append( Vertex(name) )  
             self._n += 1
 
 
+        def insertVertices(self, names):
+            for name in names:
+                self.insertVertex(name)
+
+
         def removeVertex(self,name):
              u = self._getIndex(name)
              if u is None:
@@ -77,12 +92,13 @@ class UndirectedGraph:
         
              self._adj.pop(u)
 
-             for i in range(self._n):
-                  self._adj[i].pop(u)
+             for row in self._adj:
+                  row.pop(u)
                   
-             for i,vertex in enumerate(self._vertexList):
-               if name == vertex.name:
-                   self._vertexList.pop(i)
+             self._vertexList.pop(u)
+             del self._index[name]
+             for i in range(u, self._n-1):
+                  self._index[self._vertexList[i].name] = i
              self._n -= 1
                
     
@@ -102,6 +118,12 @@ class UndirectedGraph:
                 self._adj[v][u] = 1
                 
         
+
+        def insertEdges(self, edges):
+            for s1, s2 in edges:
+                self.insertEdge(s1, s2)
+
+
         def removeEdge(self, s1,s2):
              u = self._getIndex(s1)
              v = self._getIndex(s2)
@@ -0,0 +1,245 @@
+import json
+from heapq import heappush, heappop
+from sys import maxsize as INFINITY
+
+from graph_core import fromEdges
+
+
+# Contraction hierarchies for repeated shortest path queries on a static
+# directed weighted graph. buildHierarchy contracts the vertices one at a
+# time, least important first, adding a shortcut u->x through v whenever
+# u->v->x is the only shortest path. A query then runs Dijkstra from s over
+# edges going up the ordering and from t over reversed edges going up, and
+# the searches meet at the highest vertex of the shortest path
+
+
+class ContractionHierarchy:
+
+        def __init__(self, names, rank, edges):
+            # edges holds (a, b, w, middle), middle is None for an edge of
+            # the original graph and the contracted vertex for a shortcut
+            self._names = names
+            self._index = { name : i for i, name in enumerate(names) }
+            self._rank = rank
+            self._edges = edges
+            self._middle = {}
+            self._up = [ [] for v in names ]
+            self._down = [ [] for v in names ]
+            for a, b, w, middle in edges:
+                self._middle[(a,b)] = (w, middle)
+                if rank[a] < rank[b]:
+                    self._up[a].append( (b,w) )
+                else:
+                    self._down[b].append( (a,w) )
+
+
+        def numShortcuts(self):
+            return sum(1 for edge in self._edges if edge[3] is not None)
+
+
+        def order(self):
+            # Vertex names from the first contracted to the last
+            return sorted(self._names, key = lambda name: self._rank[self._index[name]])
+
+
+        def _search(self, s, t):
+            graphs = (self._up, self._down)
+            distance = ( {s : 0}, {t : 0} )
+            predecessor = ( {s : None}, {t : None} )
+            heaps = ( [(0, s)], [(0, t)] )
+            best = INFINITY
+            meet = None
+
+            side = 0
+            while heaps[0] or heaps[1]:
+                if not heaps[side]:
+                    side = 1 - side
+                d, c = heappop(heaps[side])
+                if d >= best:
+                    # Nothing left on this side can improve the answer
+                    del heaps[side][:]
+                elif d == distance[side][c]:
+                    if c in distance[1-side] and d + distance[1-side][c] < best:
+                        best = d + distance[1-side][c]
+                        meet = c
+                    for v, w in graphs[side][c]:
+                        if d + w < distance[side].get(v, INFINITY):
+                            distance[side][v] = d + w
+                            predecessor[side][v] = c
+                            heappush(heaps[side], (d + w, v))
+                side = 1 - side
+
+            if meet is None:
+                return INFINITY, None
+
+            forward = []
+            v = meet
+            while v is not None:
+                forward.append(v)
+                v = predecessor[0][v]
+            forward.reverse()
+            v = predecessor[1][meet]
+            while v is not None:
+                forward.append(v)
+                v = predecessor[1][v]
+            return best, forward
+
+
+        def _unpack(self, path):
+            # Replaces every shortcut a->b on the path by a->middle->b
+            result = [path[0]]
+            stack = [ (a,b) for a, b in reversed(list(zip(path, path[1:]))) ]
+            while stack:
+                a, b = stack.pop()
+                middle = self._middle[(a,b)][1]
+                if middle is None:
+                    result.append(b)
+                else:
+                    stack.append( (middle,b) )
+                    stack.append( (a,middle) )
+            return result
+
+
+        def query(self, source, destination):
+            # Returns the distance and the names on a shortest path, or None
+            # when there is no path
+            s = self._index.get(source)
+            t = self._index.get(destination)
+            if s is None:
+               print("Start vertex not present in the graph")
+               return
+            if t is None:
+               print("End vertex not present in the graph")
+               return
+
+            d, path = self._search(s, t)
+            if path is None:
+                return None
+            return d, [self._names[v] for v in self._unpack(path)]
+
+
+        def distance(self, source, destination):
+            s = self._index.get(source)
+            t = self._index.get(destination)
+            if s is None or t is None:
+               print("Vertex not present in the graph")
+               return
+            return self._search(s, t)[0]
+
+
+        def save(self, fileName):
+            with open(fileName, "w") as f:
+                json.dump( { "names" : self._names, "rank" : self._rank, "edges" : self._edges }, f )
+
+
+def loadHierarchy(fileName):
+    with open(fileName) as f:
+        data = json.load(f)
+    return ContractionHierarchy( data["names"], data["rank"], [tuple(edge) for edge in data["edges"]] )
+
+
+def _witnessSearch(out, u, skip, limit, maxSettled):
+    # Dijkstra from u that avoids skip and gives up past limit or after
+    # maxSettled vertices, the distances found are upper bounds
+    distance = {u : 0}
+    heap = [(0, u)]
+    settled = 0
+    while heap and settled < maxSettled:
+        d, c = heappop(heap)
+        if d > distance[c]:
+            continue
+        if d > limit:
+            break
+        settled += 1
+        for v, w in out[c].items():
+            if v != skip and d + w < distance.get(v, INFINITY):
+                distance[v] = d + w
+                heappush(heap, (d + w, v))
+    return distance
+
+
+def _shortcuts(out, inc, v, maxSettled):
+    shortcuts = []
+    if not out[v]:
+        return shortcuts
+    maxOut = max(out[v].values())
+    for u, wu in inc[v].items():
+        distance = _witnessSearch(out, u, v, wu + maxOut, maxSettled)
+        for x, wx in out[v].items():
+            if x != u and distance.get(x, INFINITY) > wu + wx:
+                shortcuts.append( (u, x, wu + wx) )
+    return shortcuts
+
+
+def buildHierarchy(graph, maxSettled=500):
+    # graph is any of the directed weighted graph classes, only its
+    # vertices() and edges() methods are used
+    names = list(graph.vertices())
+    index = { name : i for i, name in enumerate(names) }
+    n = len(names)
+
+    out = [ {} for v in range(n) ]
+    inc = [ {} for v in range(n) ]
+    edges = {}
+    for s1, s2, w in graph.edges():
+        a = index[s1]
+        b = index[s2]
+        if w < out[a].get(b, INFINITY):
+            out[a][b] = w
+            inc[b][a] = w
+            edges[(a,b)] = (w, None)
+
+    contractedNeighbours = [0] * n
+
+    def priority(v):
+        # Edge difference plus the number of contracted neighbours, which
+        # spreads the contraction evenly over the graph
+        added = len(_shortcuts(out, inc, v, maxSettled))
+        return added - len(out[v]) - len(inc[v]) + contractedNeighbours[v]
+
+    heap = [ (priority(v), v) for v in range(n) ]
+    heap.sort()
+    rank = [None] * n
+    nextRank = 0
+
+    while heap:
+        p, v = heappop(heap)
+        # Lazy update, priorities of the other vertices change as the graph
+        # is contracted so v is put back if it is no longer the minimum
+        p = priority(v)
+        if heap and p > heap[0][0]:
+            heappush(heap, (p, v))
+            continue
+
+        for u, x, w in _shortcuts(out, inc, v, maxSettled):
+            if w < out[u].get(x, INFINITY):
+                out[u][x] = w
+                inc[x][u] = w
+                edges[(u,x)] = (w, v)
+
+        for x in out[v]:
+            del inc[x][v]
+            contractedNeighbours[x] += 1
+        for u in inc[v]:
+            del out[u][v]
+            contractedNeighbours[u] += 1
+
+        rank[v] = nextRank
+        nextRank += 1
+
+    return ContractionHierarchy( names, rank, [ (a, b, w, middle) for (a,b), (w, middle) in edges.items() ] )
+
+
+if __name__ == '__main__':
+
+  g = fromEdges( [ ("Zero", "Three", 2), ("Zero", "One", 5), ("Zero", "Four", 8), ("One", "Four", 2),
+                   ("Two", "One", 3), ("Two", "Five", 4), ("Three", "Four", 7), ("Three", "Six", 8),
+                   ("Four", "Five", 9), ("Four", "Seven", 4), ("Five", "One", 6), ("Six", "Seven", 9),
+                   ("Seven", "Three", 5), ("Seven", "Five", 3), ("Seven", "Eight", 5), ("Eight", "Five", 3) ] )
+
+  ch = buildHierarchy(g)
+  print("Contraction order :", ch.order())
+  print("Number of shortcuts :", ch.numShortcuts())
+  print("Zero to Eight :", ch.query("Zero", "Eight"))
+  print("Six to Five :", ch.query("Six", "Five"))
+  print("Five to Zero :", ch.query("Five", "Zero"))
@@ -0,0 +1,272 @@
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+
+from graph_core import fromEdges
+
+
+# Binary CSR file for large read-only graphs. The file is opened with mmap
+# and the arrays are read in place through memoryviews, so opening costs
+# nothing whatever the size and several processes mapping the same file
+# share its pages. The layout, in native byte order with every section
+# starting on an 8 byte boundary, is
+#
+#   header       magic, byte order, n, m, weight kind
+#   offsets      int64 [n+1]   out-edges of u are targets[offsets[u]:offsets[u+1]]
+#   targets      int64 [m]     sorted within each row
+#   weights      int64 or float64 [m], absent for unweighted graphs
+#   indegrees    int64 [n]
+#   nameOffsets  int64 [n+1]   name of u is nameBytes[nameOffsets[u]:nameOffsets[u+1]]
+#   sortedIds    int64 [n]     vertex ids in order of their UTF-8 names
+#   nameBytes    UTF-8 text
+#
+# Vertex names are stored as text, so names that are not strings come back
+# as their str()
+
+MAGIC = b"CSRGRAPH"
+HEADER = struct.Struct("<8s8sqqq")
+
+UNWEIGHTED = 0
+INT_WEIGHTS = 1
+FLOAT_WEIGHTS = 2
+
+
+def _pad(f):
+    f.write( b"\0" * (-f.tell() % 8) )
+
+
+def writeGraph(graph, fileName, directed=None):
+    # graph is any of the graph classes, only vertices() and edges() are
+    # used. Edges of an undirected graph are listed once by edges() and
+    # are written in both directions. directed is taken from
+    # graph.isDirected() when the class has it and must be given otherwise
+    if directed is None:
+        if not hasattr(graph, "isDirected"):
+            raise ValueError("directed must be given for a graph without isDirected()")
+        directed = graph.isDirected()
+    names = [str(name) for name in graph.vertices()]
+    index = { name : i for i, name in enumerate(names) }
+    n = len(names)
+
+    rows = [ [] for u in range(n) ]
+    kind = UNWEIGHTED
+    for edge in graph.edges():
+        u = index[str(edge[0])]
+        v = index[str(edge[1])]
+        w = edge[2] if len(edge) > 2 else 1
+        if len(edge) > 2:
+            kind = max(kind, FLOAT_WEIGHTS if isinstance(w, float) else INT_WEIGHTS)
+        rows[u].append( (v,w) )
+        if not directed:
+            rows[v].append( (u,w) )
+
+    offsets = array("q", [0])
+    targets = array("q")
+    weights = array("d" if kind == FLOAT_WEIGHTS else "q")
+    indegrees = array("q", [0] * n)
+    for row in rows:
+        row.sort()
+        for v, w in row:
+            targets.append(v)
+            weights.append(w)
+            indegrees[v] += 1
+        offsets.append(len(targets))
+
+    encoded = [name.encode("utf-8") for name in names]
+    nameOffsets = array("q", [0])
+    for e in encoded:
+        nameOffsets.append(nameOffsets[-1] + len(e))
+    sortedIds = array("q", sorted(range(n), key = lambda u: encoded[u]))
+
+    with open(fileName, "wb") as f:
+        f.write( HEADER.pack(MAGIC, sys.byteorder.encode().ljust(8, b"\0"), n, len(targets), kind) )
+        for section in (offsets, targets):
+            section.tofile(f)
+        if kind != UNWEIGHTED:
+            weights.tofile(f)
+        for section in (indegrees, nameOffsets, sortedIds):
+            section.tofile(f)
+        f.write( b"".join(encoded) )
+        _pad(f)
+
+
+class MappedGraph:
+
+        # Read-only graph over a file written by writeGraph, with the query
+        # methods of the in-memory graph classes
+        def __init__(self, fileName):
+            self._file = open(fileName, "rb")
+            self._map = mmap.mmap(self._file.fileno(), 0, access = mmap.ACCESS_READ)
+            magic, byteorder, n, m, kind = HEADER.unpack_from(self._map, 0)
+            if magic != MAGIC:
+                raise ValueError(fileName + " is not a CSR graph file")
+            if byteorder.rstrip(b"\0").decode() != sys.byteorder:
+                raise ValueError(fileName + " was written on a machine with another byte order")
+
+            self._n = n
+            self._m = m
+            self._kind = kind
+            view = self._view = memoryview(self._map)
+
+            def section(start, count, typecode):
+                return view[start : start + 8*count].cast(typecode), start + 8*count
+
+            pos = HEADER.size
+            self._offsets, pos = section(pos, n+1, "q")
+            self._targets, pos = section(pos, m, "q")
+            if kind != UNWEIGHTED:
+                self._weights, pos = section(pos, m, "d" if kind == FLOAT_WEIGHTS else "q")
+            else:
+                self._weights = None
+            self._indegrees, pos = section(pos, n, "q")
+            self._nameOffsets, pos = section(pos, n+1, "q")
+            self._sortedIds, pos = section(pos, n, "q")
+            self._nameBytes = view[pos : pos + self._nameOffsets[n]]
+
+
+        def close(self):
+            for v in (self._offsets, self._targets, self._weights, self._indegrees,
+                      self._nameOffsets, self._sortedIds, self._nameBytes, self._view):
+                if v is not None:
+                    v.release()
+            self._map.close()
+            self._file.close()
+
+
+        def __enter__(self):
+            return self
+
+
+        def __exit__(self, *args):
+            self.close()
+
+
+        def _nameBytesOf(self, u):
+            return self._nameBytes[ self._nameOffsets[u] : self._nameOffsets[u+1] ].tobytes()
+
+
+        def name(self, u):
+            return self._nameBytesOf(u).decode("utf-8")
+
+
+        def index(self, s):
+            # Binary search of the name table, nothing is loaded on open
+            key = str(s).encode("utf-8")
+            lo = 0
+            hi = self._n
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if self._nameBytesOf(self._sortedIds[mid]) < key:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            if lo < self._n and self._nameBytesOf(self._sortedIds[lo]) == key:
+                return self._sortedIds[lo]
+            return None
+
+
+        def csr(self):
+            # Zero copy (offsets, targets, weights) views, weights is None
+            # for an unweighted graph
+            return self._offsets, self._targets, self._weights
+
+
+        def numVertices(self):
+            return self._n
+
+
+        def numEdges(self):
+            return self._m
+
+
+        def vertices(self):
+            return [self.name(u) for u in range(self._n)]
+
+
+        def edges(self):
+            edgesList = []
+            for u in range(self._n):
+                for i in range(self._offsets[u], self._offsets[u+1]):
+                    if self._weights is None:
+                        edgesList.append( (self.name(u), self.name(self._targets[i])) )
+                    else:
+                        edgesList.append( (self.name(u), self.name(self._targets[i]), self._weights[i]) )
+            return edgesList
+
+
+        def _edgeIndex(self, u, v):
+            lo = self._offsets[u]
+            hi = self._offsets[u+1]
+            i = bisect_left(self._targets, v, lo, hi)
+            if i < hi and self._targets[i] == v:
+                return i
+            return None
+
+
+        def isAdjacent(self, s1, s2):
+            u = self.index(s1)
+            v = self.index(s2)
+            if u is None:
+               print("Start vertex not present in the graph")
+               return False
+            if v is None:
+               print("End vertex not present in the graph")
+               return False
+            return self._edgeIndex(u, v) is not None
+
+
+        def weight(self, s1, s2):
+            u = self.index(s1)
+            v = self.index(s2)
+            if u is None or v is None:
+               print("Vertex not present in the graph")
+               return
+            i = self._edgeIndex(u, v)
+            if i is None:
+               return None
+            return 1 if self._weights is None else self._weights[i]
+
+
+        def successors(self, s):
+            u = self.index(s)
+            if u is None:
+                print("Vertex not present in the graph")
+                return
+            return [ self.name(self._targets[i]) for i in range(self._offsets[u], self._offsets[u+1]) ]
+
+
+        def outdegree(self, s):
+            u = self.index(s)
+            if u is None:
+                print("Vertex not present in the graph")
+                return
+            return self._offsets[u+1] - self._offsets[u]
+
+
+        def indegree(self, s):
+            u = self.index(s)
+            if u is None:
+                print("Vertex not present in the graph")
+                return
+            return self._indegrees[u]
+
+
+if __name__ == '__main__':
+
+  import os
+  import tempfile
+
+  g = fromEdges( [ ("AA","BB",3), ("AA","CC",5), ("CC","DD",4), ("DD","AA",2), ("CC","AA",7), ("BB","EE",9) ] )
+  fileName = os.path.join(tempfile.gettempdir(), "graph.csr")
+  writeGraph(g, fileName)
+
+  with MappedGraph(fileName) as mg:
+      print("Number of vertices : ", mg.numVertices())
+      print("Number of edges : ", mg.numEdges())
+      print("List of Edges : ", mg.edges())
+      print("Successors of CC :", mg.successors("CC"))
+      print("Indegree of AA :", mg.indegree("AA"), " Outdegree of AA :", mg.outdegree("AA"))
+      print("Edge from DD to AA :", mg.isAdjacent("DD", "AA"), " weight", mg.weight("DD", "AA"))
+  os.remove(fileName)
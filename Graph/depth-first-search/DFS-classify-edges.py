@@ -1,8 +1,17 @@
 
 
+from itertools import chain
+
 INITIAL = 0
 VISITED = 1
 FINISHED = 2 
+
+TREE = 0
+BACK = 1
+FORWARD = 2
+CROSS = 3
+
+EDGE_LABELS = { TREE : "Tree Edge - ", BACK : "Back Edge - ", FORWARD : "Forward Edge -", CROSS : "Cross Edge -" }
         
 class Vertex:
         def __init__(self, name):
@@ -18,6 +27,7 @@ class DirectedGraph:
            self._adj = [  [0 for column in range(size)]  for row in range(size) ]
            self._n = 0
            self._vertexList = []
+           self._index = {}
            
 
         def display(self):
@@ -54,23 +64,37 @@ class DirectedGraph:
 
 
         def _getIndex(self,s):
-            index = 0
-            for name in (vertex.name for vertex in self._vertexList):
-                if s == name:
-                   return index
-                index += 1
-            return None
+            return self._index.get(s)
+
+
+        def _grow(self):
+             # Double the capacity so that a run of insertions costs
+             # amortized O(V) per vertex
+             capacity = max(1, 2*len(self._adj))
+             for row in self._adj:
+                  row.extend( [0] * (capacity - len(row)) )
+             for i in range(capacity - len(self._adj)):
+                  self._adj.append( [0] * capacity )
 
 
         def insertVertex(self,name):
-            if name in (vertex.name for vertex in self._vertexList): ######## 
+            if name in self._index:
                 print("Vertex with this name already present in the graph")
                 return
                 
+            if self._n == len(self._adj):
+                self._grow()
+
+            self._index[name] = self._n
             self._vertexList.append( Vertex(name) )  
             self._n += 1
 
 
+        def insertVertices(self, names):
+            for name in names:
+                self.insertVertex(name)
+
+
         def removeVertex(self,name):
              u = self._getIndex(name)
              if u is None:
@@ -79,12 +103,13 @@ class DirectedGraph:
         
              self._adj.pop(u)
 
-             for i in range(self._n):
-                  self._adj[i].pop(u)
+             for row in self._adj:
+                  row.pop(u)
                   
-             for i,vertex in enumerate(self._vertexList):
-               if name == vertex.name:
-                   self._vertexList.pop(i)
+             self._vertexList.pop(u)
+             del self._index[name]
+             for i in range(u, self._n-1):
+                  self._index[self._vertexList[i].name] = i
              self._n -= 1
                
     
@@ -103,6 +128,12 @@ class DirectedGraph:
                 self._adj[u][v] = 1
                 
         
+
+        def insertEdges(self, edges):
+            for s1, s2 in edges:
+                self.insertEdge(s1, s2)
+
+
         def removeEdge(self, s1,s2):
              u = self._getIndex(s1)
              v = self._getIndex(s2)
@@ -155,28 +186,49 @@ class DirectedGraph:
             return ind
 
 
-        def _dfs(self,v):
-             
-             self._vertexList[v].state = VISITED
-             DirectedGraph.time += 1
-             self._vertexList[v].discoveryTime = DirectedGraph.time
-
-             for i in range(self._n):
-                 if self._adj[v][i]!=0:
-                    if self._vertexList[i].state == INITIAL:
-                        print("Tree Edge - ", self._vertexList[v].name, ",", self._vertexList[i].name)
-                        self._dfs(i)
-                    elif self._vertexList[i].state == VISITED:
-                        print("Back Edge - ", self._vertexList[v].name, ",", self._vertexList[i].name)
-                    elif self._vertexList[v].discoveryTime < self._vertexList[i].discoveryTime:
-                        print("Forward Edge -", self._vertexList[v].name, ",", self._vertexList[i].name)
+        def dfsEvents(self, roots=()):
+            # Depth first search with an explicit stack instead of recursion.
+            # Yields ("discover", v, time), ("edge", v, i, kind) and
+            # ("finish", v, time) as they happen. The search starts from roots
+            # and then from every vertex still unvisited, in index order
+            succ = [ [i for i in range(self._n) if self._adj[v][i] != 0] for v in range(self._n) ]
+            state = [INITIAL] * self._n
+            discovery = [0] * self._n
+            time = 0
+
+            for r in chain(roots, range(self._n)):
+                if state[r] != INITIAL:
+                    continue
+
+                state[r] = VISITED
+                time += 1
+                discovery[r] = time
+                yield ("discover", r, time)
+                stack = [ (r, iter(succ[r])) ]
+
+                while stack:
+                    v, neighbours = stack[-1]
+                    i = next(neighbours, None)
+
+                    if i is None:
+                        stack.pop()
+                        state[v] = FINISHED
+                        time += 1
+                        yield ("finish", v, time)
+                    elif state[i] == INITIAL:
+                        yield ("edge", v, i, TREE)
+                        state[i] = VISITED
+                        time += 1
+                        discovery[i] = time
+                        yield ("discover", i, time)
+                        stack.append( (i, iter(succ[i])) )
+                    elif state[i] == VISITED:
+                        yield ("edge", v, i, BACK)
+                    elif discovery[v] < discovery[i]:
+                        yield ("edge", v, i, FORWARD)
                     else:
-                        print("Cross Edge -", self._vertexList[v].name, ",", self._vertexList[i].name)
-                              
-             self._vertexList[v].state = FINISHED
-             DirectedGraph.time += 1
-             self._vertexList[v].finishingTime = DirectedGraph.time
-          
+                        yield ("edge", v, i, CROSS)
+
 
         def dfsTraversalAll(self):
             s = input("Enter starting vertex for Depth First Search : ")
@@ -185,42 +237,82 @@ class DirectedGraph:
                  print("Vertex not present in the graph")
                  return
 
-            for v in range(self._n):
-                self._vertexList[v].state = INITIAL
-                    
-            DirectedGraph.time = 0
-            
-            self._dfs(u)
-
-            for v in range(self._n):
-                if self._vertexList[v].state == INITIAL:
-                     self._dfs(v)
+            for event in self.dfsEvents([u]):
+                if event[0] == "discover":
+                    self._vertexList[event[1]].discoveryTime = event[2]
+                elif event[0] == "finish":
+                    self._vertexList[event[1]].finishingTime = event[2]
+                else:
+                    v, i, kind = event[1:]
+                    print(EDGE_LABELS[kind], self._vertexList[v].name, ",", self._vertexList[i].name)
 
            
         def isCyclic(self):
+            # A directed graph has a cycle if and only if DFS finds a back edge,
+            # the search stops at the first one
+            for event in self.dfsEvents():
+                if event[0] == "edge" and event[3] == BACK:
+                     return True
+            return False
+
+
+        def topologicalOrder(self):
+            # Vertex names in decreasing finishing time, which puts every edge
+            # forward. Returns None if the search finds a back edge
+            order = []
+            for event in self.dfsEvents():
+                if event[0] == "finish":
+                    order.append(self._vertexList[event[1]].name)
+                elif event[0] == "edge" and event[3] == BACK:
+                    return None
+            order.reverse()
+            return order
+
+
+        def stronglyConnectedComponents(self):
+            # Kosaraju's algorithm. The vertices are taken in decreasing
+            # finishing time of a DFS of the graph and each search of the
+            # reversed graph from them collects one component. Components are
+            # numbered in topological order of the condensation
+            order = [event[1] for event in self.dfsEvents() if event[0] == "finish"]
+            pred = [ [u for u in range(self._n) if self._adj[u][v] != 0] for v in range(self._n) ]
+
+            component = [None] * self._n
+            c = 0
+            for r in reversed(order):
+                if component[r] is not None:
+                    continue
+                component[r] = c
+                stack = [r]
+                while stack:
+                    v = stack.pop()
+                    for u in pred[v]:
+                        if component[u] is None:
+                            component[u] = c
+                            stack.append(u)
+                c += 1
+            return component
+
+
+        def condensation(self):
+            # Returns the component id of every vertex, the vertex names of
+            # each component, the edges of the condensation DAG and a
+            # topological order of its components
+            component = self.stronglyConnectedComponents()
+            numComponents = max(component) + 1 if component else 0
+
+            members = [ [] for c in range(numComponents) ]
             for v in range(self._n):
-                 self._vertexList[v].state = INITIAL
-            
-            DirectedGraph.hasCycle = False
+                members[component[v]].append(self._vertexList[v].name)
 
-            for v in range(self._n):
-                if self._vertexList[v].state == INITIAL:
-                     self._dfsC(v)
-            return DirectedGraph.hasCycle
-        
+            dagEdges = set()
+            for u in range(self._n):
+                for v in range(self._n):
+                    if self._adj[u][v] != 0 and component[u] != component[v]:
+                        dagEdges.add( (component[u], component[v]) )
+
+            return component, members, sorted(dagEdges), list(range(numComponents))
 
-        def _dfsC(self,v):
-            self._vertexList[v].state = VISITED
-                    
-            for i in range(self._n):
-                if self._adj[v][i]!=0:
-                   if self._vertexList[i].state == INITIAL:
-                       self._dfsC(i)
-                   elif self._vertexList[i].state == VISITED: #checking for back edge
-                       DirectedGraph.hasCycle = True
-            self._vertexList[v].state = FINISHED
-        
-        
 
 if __name__ == '__main__':
 
@@ -281,4 +373,12 @@ if __name__ == '__main__':
          print("Graph is Cyclic")
      else:
          print("Graph is Acylic")
-   
+     print("Topological order :", g.topologicalOrder())
+
+     g.insertEdge("Three","Zero")
+     g.insertEdge("Ten","Six")
+     print("Graph has a cycle :", g.isCyclic())
+     component, members, dagEdges, order = g.condensation()
+     print("Strongly connected components :", members)
+     print("Condensation edges :", dagEdges)
+     print("Topological order of the components :", order)
@@ -15,6 +15,7 @@ class DirectedGraph:
            self._adj = [  [0 for column in range(size)]  for row in range(size) ]
            self._n = 0
            self._vertexList = []
+           self._index = {}
            
 
         def display(self):
@@ -51,23 +52,37 @@ class DirectedGraph:
 
 
         def _getIndex(self,s):
-            index = 0
-            for name in (vertex.name for vertex in self._vertexList):
-                if s == name:
-                   return index
-                index += 1
-            return None
+            return self._index.get(s)
+
+
+        def _grow(self):
+             # Double the capacity so that a run of insertions costs
+             # amortized O(V) per vertex
+             capacity = max(1, 2*len(self._adj))
+             for row in self._adj:
+                  row.extend( [0] * (capacity - len(row)) )
+             for i in range(capacity - len(self._adj)):
+                  self._adj.append( [0] * capacity )
 
 
         def insertVertex(self,name):
-            if name in (vertex.name for vertex in self._vertexList): ######## 
+            if name in self._index:
                 print("Vertex with this name already present in the graph")
                 return
                 
+            if self._n == len(self._adj):
+                self._grow()
+
+            self._index[name] = self._n
             self._vertexList.append( Vertex(name) )  
             self._n += 1
 
 
+        def insertVertices(self, names):
+            for name in names:
+                self.insertVertex(name)
+
+
         def removeVertex(self,name):
              u = self._getIndex(name)
              if u is None:
@@ -76,12 +91,13 @@ class DirectedGraph:
         
              self._adj.pop(u)
 
-             for i in range(self._n):
-                  self._adj[i].pop(u)
+             for row in self._adj:
+                  row.pop(u)
                   
-             for i,vertex in enumerate(self._vertexList):
-               if name == vertex.name:
-                   self._vertexList.pop(i)
+             self._vertexList.pop(u)
+             del self._index[name]
+             for i in range(u, self._n-1):
+                  self._index[self._vertexList[i].name] = i
              self._n -= 1
                
     
@@ -100,6 +116,12 @@ class DirectedGraph:
                 self._adj[u][v] = 1
                 
         
+
+        def insertEdges(self, edges):
+            for s1, s2 in edges:
+                self.insertEdge(s1, s2)
+
+
         def removeEdge(self, s1,s2):
              u = self._getIndex(s1)
              v = self._getIndex(s2)
@@ -167,13 +189,27 @@ class DirectedGraph:
 
 
         def _dfs(self,v):
+             # Explicit stack of (vertex, next column to scan) in place of
+             # recursion, so deep graphs do not hit the recursion limit
              print(self._vertexList[v].name , end = " ")
              self._vertexList[v].state = VISITED
-
-             for i in range(self._n):
-                 if self._adj[v][i]!=0 and self._vertexList[i].state == INITIAL:
-                    self._dfs(i)
-             self._vertexList[v].state = FINISHED
+             stack = [ [v, 0] ]
+
+             while stack:
+                 top = stack[-1]
+                 v = top[0]
+                 i = top[1]
+                 while i < self._n and not (self._adj[v][i]!=0 and self._vertexList[i].state == INITIAL):
+                     i += 1
+                 top[1] = i + 1
+
+                 if i < self._n:
+                    print(self._vertexList[i].name , end = " ")
+                    self._vertexList[i].state = VISITED
+                    stack.append( [i, 0] )
+                 else:
+                    self._vertexList[v].state = FINISHED
+                    stack.pop()
           
 
         def dfsTraversalAll(self):
@@ -1,21 +1,47 @@
 
 
 from sys import maxsize as INFINITY
-
-TEMPORARY = 1
-PERMANENT = 2
+from heapq import heappush, heappop
+from multiprocessing import Pool, RawArray, cpu_count
 
 class Vertex:
         def __init__(self, name):
            self.name = name
 
           
+_shared = None
+
+def _initWorker(offsets, targets, weights, delta):
+    global _shared
+    _shared = (offsets, targets, weights, delta)
+
+
+def _requests(task):
+    # Relaxation requests (v, distance, u) for the light or the heavy
+    # out-edges of the vertices u of a frontier, only the shortest request
+    # for each v is kept
+    frontier, light = task
+    offsets, targets, weights, delta = _shared
+    best = {}
+    for u, d in frontier:
+        for i in range(offsets[u], offsets[u+1]):
+            w = weights[i]
+            if (w <= delta) == light:
+                v = targets[i]
+                if v not in best or d + w < best[v][0]:
+                    best[v] = (d + w, u)
+    return [ (v, d, u) for v, (d, u) in best.items() ]
+
+
 class DirectedWeightedGraph:
 
         def __init__(self, size=20):
            self._adj = [  [0 for column in range(size)]  for row in range(size) ]
            self._n = 0
            self._vertexList = []
+           self._index = {}
+           self._csr = None
+           self._reverseCsr = None
 
 
         def display(self):
@@ -52,21 +78,37 @@ class DirectedWeightedGraph:
 
 
         def _getIndex(self,s):
-            index = 0
-            for name in (vertex.name for vertex in self._vertexList):
-                if s == name:
-                   return index
-                index += 1
-            return None
+            return self._index.get(s)
             
 
+        def _grow(self):
+             # Double the capacity so that a run of insertions costs
+             # amortized O(V) per vertex
+             capacity = max(1, 2*len(self._adj))
+             for row in self._adj:
+                  row.extend( [0] * (capacity - len(row)) )
+             for i in range(capacity - len(self._adj)):
+                  self._adj.append( [0] * capacity )
+
+
         def insertVertex(self,name):
-            if name in (vertex.name for vertex in self._vertexList): ######## 
+            if name in self._index:
                 print("Vertex with this name already present in the graph")
                 return
 
+            if self._n == len(self._adj):
+                self._grow()
+
+            self._index[name] = self._n
             self._vertexList.append( Vertex(name) )  
             self._n += 1
+            self._csr = None
+            self._reverseCsr = None
+
+
+        def insertVertices(self, names):
+            for name in names:
+                self.insertVertex(name)
 
 
         def removeVertex(self,name):
@@ -77,11 +119,16 @@ class DirectedWeightedGraph:
              
              self._adj.pop(u)
 
-             for i in range(self._n):
-                  self._adj[i].pop(u)
+             for row in self._adj:
+                  row.pop(u)
                   
              self._vertexList.pop(u)
+             del self._index[name]
+             for i in range(u, self._n-1):
+                  self._index[self._vertexList[i].name] = i
              self._n -= 1
+             self._csr = None
+             self._reverseCsr = None
 
 
         def insertEdge(self, s1, s2, w):
@@ -97,8 +144,16 @@ class DirectedWeightedGraph:
                 print("Edge already present in the graph") 
             else:  
                 self._adj[u][v] = w 
+                self._csr = None
+                self._reverseCsr = None
                 
         
+
+        def insertEdges(self, edges):
+            for s1, s2, w in edges:
+                self.insertEdge(s1, s2, w)
+
+
         def removeEdge(self, s1, s2):
              u = self._getIndex(s1)
              v = self._getIndex(s2)
@@ -111,6 +166,8 @@ class DirectedWeightedGraph:
                 print("Edge not present in the graph")
              else:        
                 self._adj[u][v] = 0
+                self._csr = None
+                self._reverseCsr = None
 
 
         def isAdjacent(self, s1, s2):
@@ -150,71 +207,257 @@ class DirectedWeightedGraph:
             return ind
 
 
-        def _dijkstra(self, s):
-       
-            for v in range(self._n):
-                self._vertexList[v].status = TEMPORARY
-                self._vertexList[v].pathLength = INFINITY
-                self._vertexList[v].predecessor = None
-            
-
-            self._vertexList[s].pathLength = 0
-
-            while True:
-                c = self._tempVertexMinPL()
+        def _buildCSR(self, reverse=False):
+            # Compressed sparse row snapshot : the out-edges of vertex u are
+            # targets[offsets[u]:offsets[u+1]] with matching weights. With
+            # reverse the in-edges are stored instead
+            offsets = [0]
+            targets = []
+            weights = []
+            for u in range(self._n):
+                for v in range(self._n):
+                    w = self._adj[v][u] if reverse else self._adj[u][v]
+                    if w != 0:
+                        targets.append(v)
+                        weights.append(w)
+                offsets.append(len(targets))
+            return offsets, targets, weights
+
+
+        def csr(self):
+            if self._csr is None:
+                self._csr = self._buildCSR()
+            return self._csr
+
+
+        def reverseCsr(self):
+            if self._reverseCsr is None:
+                self._reverseCsr = self._buildCSR(reverse=True)
+            return self._reverseCsr
+
+
+        def dijkstra(self, s):
+            offsets, targets, weights = self.csr()
+
+            distance = [INFINITY] * self._n
+            predecessor = [None] * self._n
+            distance[s] = 0
+
+            heap = [(0, s)]
+            while heap:
+                d, c = heappop(heap)
+                if d > distance[c]:       # stale entry, c already made permanent
+                    continue
+
+                for i in range(offsets[c], offsets[c+1]):
+                    v = targets[i]
+                    nd = d + weights[i]
+                    if nd < distance[v]:
+                        distance[v] = nd
+                        predecessor[v] = c
+                        heappush(heap, (nd, v))
+
+            return distance, predecessor
+
+
+        def deltaStepping(self, s, delta=None, processes=1, parallelFrontier=1024):
+            # Delta-stepping. Tentative distances are kept in buckets of width
+            # delta and the lowest bucket is emptied by relaxing the light
+            # edges (w <= delta) of all its vertices at once, repeating while
+            # they put vertices back in it. The heavy edges of the vertices
+            # settled from the bucket are relaxed once at the end. Frontiers
+            # of at least parallelFrontier vertices are split over a process
+            # pool that reads the CSR arrays from shared memory
+            offsets, targets, weights = self.csr()
+            if delta is None:
+                delta = sum(weights) / len(weights) if weights else 1
+
+            distance = [INFINITY] * self._n
+            predecessor = [None] * self._n
+            buckets = {}
+
+            def relax(v, d, u):
+                if d < distance[v]:
+                    if distance[v] != INFINITY:
+                        # The bucket of v may be the one being emptied
+                        buckets.get(int(distance[v] // delta), set()).discard(v)
+                    distance[v] = d
+                    predecessor[v] = u
+                    buckets.setdefault(int(d // delta), set()).add(v)
+
+            pool = None
+            workers = processes or cpu_count()
+            if workers != 1:
+                typecode = "d" if any(isinstance(w, float) for w in weights) else "q"
+                shared = ( RawArray("q", offsets), RawArray("q", targets), RawArray(typecode, weights), delta )
+                pool = Pool(workers, _initWorker, shared)
+            else:
+                _initWorker(offsets, targets, weights, delta)
+
+            def bulkRelax(vertices, light):
+                frontier = [ (u, distance[u]) for u in vertices ]
+                if pool is None or len(frontier) < parallelFrontier:
+                    results = [ _requests( (frontier, light) ) ]
+                else:
+                    step = -(-len(frontier) // (4 * workers))
+                    results = pool.map( _requests, [ (frontier[i:i+step], light) for i in range(0, len(frontier), step) ] )
+                for requests in results:
+                    for v, d, u in requests:
+                        relax(v, d, u)
+
+            try:
+                relax(s, 0, None)
+                while buckets:
+                    i = min(buckets)
+                    settled = set()
+                    while buckets.get(i):
+                        frontier = buckets.pop(i)
+                        settled |= frontier
+                        bulkRelax(frontier, True)
+                    buckets.pop(i, None)
+                    bulkRelax(settled, False)
+            finally:
+                if pool is not None:
+                    pool.close()
+                    pool.join()
+
+            return distance, predecessor
+
+
+        def bidirectionalDijkstra(self, s, t):
+            # Dijkstra from s over out-edges and from t over in-edges, one
+            # step of each in turn. best is the shortest s-t path seen where
+            # the two searches touch, it is final once the two heap minimums
+            # add up to at least best
+            graphs = (self.csr(), self.reverseCsr())
+            distance = ( {s : 0}, {t : 0} )
+            predecessor = ( {s : None}, {t : None} )
+            done = ( set(), set() )
+            heaps = ( [(0, s)], [(0, t)] )
+            best = 0 if s == t else INFINITY
+            meet = s
+
+            side = 0
+            while heaps[0] and heaps[1] and heaps[0][0][0] + heaps[1][0][0] < best:
+                d, c = heappop(heaps[side])
+                if c not in done[side]:
+                    done[side].add(c)
+                    offsets, targets, weights = graphs[side]
+                    dist = distance[side]
+                    other = distance[1-side]
+                    for i in range(offsets[c], offsets[c+1]):
+                        v = targets[i]
+                        nd = d + weights[i]
+                        if nd < dist.get(v, INFINITY):
+                            dist[v] = nd
+                            predecessor[side][v] = c
+                            heappush(heaps[side], (nd, v))
+                        if v in other and nd + other[v] < best:
+                            best = nd + other[v]
+                            meet = v
+                side = 1 - side
+
+            if best == INFINITY:
+                return INFINITY, None
+
+            path = []
+            v = meet
+            while v is not None:
+                path.append(v)
+                v = predecessor[0][v]
+            path.reverse()
+            v = predecessor[1][meet]
+            while v is not None:
+                path.append(v)
+                v = predecessor[1][v]
+            return best, path
+
+
+        def astar(self, s, t, heuristic):
+            # heuristic(u, t) must never overestimate the distance from u to t
+            # and must be consistent, the search stops as soon as t is settled
+            offsets, targets, weights = self.csr()
+            distance = {s : 0}
+            predecessor = {s : None}
+            done = set()
+
+            heap = [(heuristic(s, t), s)]
+            while heap:
+                f, c = heappop(heap)
+                if c in done:
+                    continue
+                if c == t:
+                    path = []
+                    while c is not None:
+                        path.append(c)
+                        c = predecessor[c]
+                    path.reverse()
+                    return distance[t], path
+                done.add(c)
+
+                for i in range(offsets[c], offsets[c+1]):
+                    v = targets[i]
+                    nd = distance[c] + weights[i]
+                    if nd < distance.get(v, INFINITY):
+                        distance[v] = nd
+                        predecessor[v] = c
+                        heappush(heap, (nd + heuristic(v, t), v))
+
+            return INFINITY, None
+
+
+        def shortestPath(self, source, destination, heuristic=None):
+            # Point to point query, A* when a heuristic is given and
+            # bidirectional Dijkstra otherwise. Returns the distance and the
+            # names on the path, or None when there is no path
+            s = self._getIndex(source)
+            t = self._getIndex(destination)
+            if s is None:
+               print("Start vertex not present in the graph")
+               return
+            if t is None:
+               print("End vertex not present in the graph")
+               return
 
-                if c == None:
-                    return
+            if heuristic is None:
+                d, path = self.bidirectionalDijkstra(s, t)
+            else:
+                d, path = self.astar(s, t, heuristic)
 
-                self._vertexList[c].status = PERMANENT
+            if path is None:
+                return None
+            return d, [self._vertexList[v].name for v in path]
 
-                for v in range(self._n):
-                   if self._adj[c][v]!=0  and self._vertexList[v].status == TEMPORARY:
-                        if self._vertexList[c].pathLength + self._adj[c][v] < self._vertexList[v].pathLength:
-                            self._vertexList[v].predecessor = c
-                            self._vertexList[v].pathLength = self._vertexList[c].pathLength + self._adj[c][v]
-                        
-            
-        def _tempVertexMinPL(self):
-            min = INFINITY
-            x = None
-            for v in range(self._n):
-                if self._vertexList[v].status == TEMPORARY and self._vertexList[v].pathLength < min:
-                   min = self._vertexList[v].pathLength
-                   x = v
-            return x
-        
 
-        def findPaths(self, source):
+        def findPaths(self, source, mode="dijkstra", processes=1):
 
             s = self._getIndex(source)
             if s is None:
                print("Vertex not present in the graph")
                return
            
-            self._dijkstra(s)
+            if mode == "delta":
+                distance, predecessor = self.deltaStepping(s, processes=processes)
+            else:
+                distance, predecessor = self.dijkstra(s)
            
             print("Source Vertex :", source)
                 
             for v in range(self._n):
                 print("Destination Vertex :", self._vertexList[v].name)
-                if self._vertexList[v].pathLength == INFINITY :
+                if distance[v] == INFINITY :
                     print("There is no path from ", source , "to vertex", self._vertexList[v].name, "\n")
                 else:
-                    self._findPath(s,v)
+                    self._findPath(s, v, distance, predecessor)
 
                 
-        def _findPath(self, s, v):
+        def _findPath(self, s, v, distance, predecessor):
              path = [] 
-             sd = 0          
-             count = 0              
+             sd = distance[v]
                 
              while v != s:
-                count += 1
                 path.append(v)
-                u = self._vertexList[v].predecessor
-                sd += self._adj[u][v]
-                v = u   
+                v = predecessor[v]
              path.append(s)
 
              print("Shortest Path is : ", end = " ")
@@ -256,4 +499,6 @@ if __name__ == '__main__':
 
   g.findPaths("Zero")
 
-      
+  print("Distances by delta-stepping :", g.deltaStepping(g._getIndex("Zero"))[0])
+  print("Zero to Eight :", g.shortestPath("Zero", "Eight"))
+  print("Zero to Eight with A* :", g.shortestPath("Zero", "Eight", lambda u, t: 0))
@@ -0,0 +1,132 @@
+import csv
+import os
+from collections import deque
+from multiprocessing import Pool
+
+from graph_core import Graph
+
+
+# Streaming loader for edge list, CSV and TSV files. The file is cut into
+# byte ranges that end on line boundaries and each range is read and parsed
+# on its own, in this process or in a pool of worker processes. The parsed
+# ranges are added to the graph in file order, interning vertex names into
+# integer ids as they are first seen and dropping duplicate edges and self
+# loops. Only a bounded window of ranges is parsed ahead of the insertion,
+# so memory does not grow with the size of the file
+
+FORMATS = ("edgelist", "csv", "tsv")
+
+
+def byteRanges(fileName, chunkSize=1 << 24):
+    # (start, end) ranges of about chunkSize bytes, each ending just after
+    # a newline so no line is split between two ranges
+    size = os.path.getsize(fileName)
+    ranges = []
+    with open(fileName, "rb") as f:
+        start = 0
+        while start < size:
+            end = min(size, start + chunkSize)
+            if end < size:
+                f.seek(end)
+                f.readline()
+                end = f.tell()
+            ranges.append( (start, end) )
+            start = end
+    return ranges
+
+
+def _number(text):
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def parseLines(lines, format="edgelist", weighted=False):
+    # Yields (s1, s2) or (s1, s2, w) for every edge line, blank lines and
+    # lines starting with # are skipped
+    if format == "csv":
+        rows = csv.reader(line for line in lines if line.strip() and not line.startswith("#"))
+    elif format == "tsv":
+        rows = ( line.rstrip("\r\n").split("\t") for line in lines if line.strip() and not line.startswith("#") )
+    else:
+        rows = ( line.split() for line in lines if line.strip() and not line.startswith("#") )
+
+    for row in rows:
+        if weighted:
+            yield (row[0], row[1], _number(row[2]))
+        else:
+            yield (row[0], row[1])
+
+
+def _parseRange(task):
+    fileName, start, end, format, weighted = task
+    with open(fileName, "rb") as f:
+        f.seek(start)
+        text = f.read(end - start).decode("utf-8")
+    return list( parseLines(text.splitlines(), format, weighted) )
+
+
+def loadEdges(fileName, format="edgelist", weighted=False, directed=True, storage="dict",
+              skipHeader=False, processes=1, chunkSize=1 << 24):
+    # Builds a graph_core.Graph from an edge file in one pass over it
+    if format not in FORMATS:
+        raise ValueError("Unknown format " + repr(format))
+
+    ranges = byteRanges(fileName, chunkSize)
+    if skipHeader and ranges:
+        with open(fileName, "rb") as f:
+            f.readline()
+            first = f.tell()
+        ranges[0] = (first, ranges[0][1])
+    tasks = [ (fileName, start, end, format, weighted) for start, end in ranges if start < end ]
+
+    g = Graph(directed, storage)
+    if processes == 1:
+        for task in tasks:
+            _addEdges(g, _parseRange(task))
+    else:
+        # At most 2*processes ranges are parsed or waiting at a time, the
+        # oldest is added to the graph before the next one is submitted so
+        # the parsed edges do not pile up when adding is the slower step
+        with Pool(processes) as pool:
+            pending = deque()
+            for task in tasks:
+                if len(pending) == 2 * processes:
+                    _addEdges(g, pending.popleft().get())
+                pending.append( pool.apply_async(_parseRange, (task,)) )
+            while pending:
+                _addEdges(g, pending.popleft().get())
+    return g
+
+
+def _addEdges(g, edges):
+    for edge in edges:
+        u = g.index(edge[0])
+        if u is None:
+            g.insertVertex(edge[0])
+            u = g.index(edge[0])
+        v = g.index(edge[1])
+        if v is None:
+            g.insertVertex(edge[1])
+            v = g.index(edge[1])
+        if u != v and not g.hasEdge(u, v):
+            g.insertEdge(*edge)
+
+
+if __name__ == '__main__':
+
+  import tempfile
+
+  fileName = os.path.join(tempfile.gettempdir(), "edges.csv")
+  with open(fileName, "w") as f:
+      f.write("source,target,weight\n")
+      f.write("Zero,One,5\nZero,Three,2\nOne,Four,2\nThree,Four,7\n")
+      f.write("# duplicates and self loops are dropped\n")
+      f.write("Zero,One,5\nFour,Four,1\nFour,Seven,4\n")
+
+  g = loadEdges(fileName, "csv", weighted=True, skipHeader=True, processes=2, chunkSize=16)
+  print("Number of vertices : ", g.numVertices())
+  print("Number of edges : ", g.numEdges())
+  print("List of Edges : ", g.edges())
+  os.remove(fileName)
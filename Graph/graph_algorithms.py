@@ -0,0 +1,231 @@
+from collections import deque
+from heapq import heapify, heappush, heappop
+from itertools import chain
+from sys import maxsize as INFINITY
+
+from graph_core import fromEdges, bits
+
+
+# The algorithms work on the integer vertex ids of a graph_core.Graph, so
+# they run unchanged whichever storage the graph uses. Results are lists
+# indexed by vertex id, g.name(u) gives back the vertex name
+
+
+def bfs(g, s):
+    distance = [INFINITY] * g.size()
+    predecessor = [None] * g.size()
+    distance[s] = 0
+
+    queue = deque([s])
+    while queue:
+        u = queue.popleft()
+        for v, w in g.successors(u):
+            if distance[v] == INFINITY:
+                distance[v] = distance[u] + 1
+                predecessor[v] = u
+                queue.append(v)
+    return distance, predecessor
+
+
+def dfs(g, s):
+    # Vertices in depth first preorder, using an explicit stack
+    visited = [False] * g.size()
+    order = []
+    stack = [s]
+    while stack:
+        u = stack.pop()
+        if visited[u]:
+            continue
+        visited[u] = True
+        order.append(u)
+        for v, w in reversed(list(g.successors(u))):
+            if not visited[v]:
+                stack.append(v)
+    return order
+
+
+def dijkstra(g, s):
+    distance = [INFINITY] * g.size()
+    predecessor = [None] * g.size()
+    distance[s] = 0
+
+    heap = [(0, s)]
+    while heap:
+        d, u = heappop(heap)
+        if d > distance[u]:
+            continue
+        for v, w in g.successors(u):
+            if d + w < distance[v]:
+                distance[v] = d + w
+                predecessor[v] = u
+                heappush(heap, (d + w, v))
+    return distance, predecessor
+
+
+def prim(g, root):
+    # Minimum spanning tree of the component of root as (u, v, w) edges
+    inTree = [False] * g.size()
+    tree = []
+    heap = [(0, root, None)]
+    while heap:
+        w, v, u = heappop(heap)
+        if inTree[v]:
+            continue
+        inTree[v] = True
+        if u is not None:
+            tree.append( (u, v, w) )
+        for x, wx in g.successors(v):
+            if not inTree[x]:
+                heappush(heap, (wx, x, v))
+    return tree
+
+
+def kruskal(g):
+    # Minimum spanning forest as (u, v, w) edges
+    edgesList = [ (w, u, v) for u in g.ids() for v, w in g.successors(u) if u < v ]
+    heapify(edgesList)
+
+    parent = list(range(g.size()))
+    rank = [0] * g.size()
+
+    def find(v):
+        while parent[v] != v:
+            parent[v] = parent[parent[v]]
+            v = parent[v]
+        return v
+
+    tree = []
+    target = g.numVertices() - 1
+    while edgesList and len(tree) < target:
+        w, u, v = heappop(edgesList)
+        r1 = find(u)
+        r2 = find(v)
+        if r1 != r2:
+            if rank[r1] < rank[r2]:
+                r1, r2 = r2, r1
+            parent[r2] = r1
+            if rank[r1] == rank[r2]:
+                rank[r1] += 1
+            tree.append( (u, v, w) )
+    return tree
+
+
+def topologicalSort(g):
+    # Kahn's algorithm, vertices whose in-degree drops to 0 are queued.
+    # Returns None when the graph has a cycle
+    offsets, targets, weights = g.csr()
+    indegree = list(g.indegrees())
+    queue = deque( u for u in g.ids() if indegree[u] == 0 )
+    order = []
+    while queue:
+        u = queue.popleft()
+        order.append(u)
+        for v in targets[offsets[u]:offsets[u+1]]:
+            indegree[v] -= 1
+            if indegree[v] == 0:
+                queue.append(v)
+    if len(order) != g.numVertices():
+        return None
+    return order
+
+
+def topologicalLevels(g):
+    # Level synchronous Kahn, level i holds the vertices whose longest path
+    # from a source has i edges, so every vertex of a level can run in
+    # parallel once the earlier levels are done. The in-degrees are
+    # decremented for all the out-edges of a level in one pass over their
+    # CSR slices. Returns None when the graph has a cycle
+    offsets, targets, weights = g.csr()
+    indegree = list(g.indegrees())
+    level = [u for u in g.ids() if indegree[u] == 0]
+    levels = []
+    count = 0
+    while level:
+        levels.append(level)
+        count += len(level)
+        nextLevel = []
+        for v in chain.from_iterable( targets[offsets[u]:offsets[u+1]] for u in level ):
+            indegree[v] -= 1
+            if indegree[v] == 0:
+                nextLevel.append(v)
+        level = nextLevel
+    if count != g.numVertices():
+        return None
+    return levels
+
+
+def criticalPath(g, duration=None):
+    # Longest path of a DAG, its length is the sum of the edge weights on it
+    # plus duration[u] for each of its vertices when durations are given.
+    # Returns (length, path) or None when the graph has a cycle
+    order = topologicalSort(g)
+    if order is None:
+        return None
+    offsets, targets, weights = g.csr()
+    start = [0] * g.size()
+    finish = [0] * g.size()
+    predecessor = [None] * g.size()
+
+    for u in order:
+        finish[u] = start[u] + (duration[u] if duration else 0)
+        for i in range(offsets[u], offsets[u+1]):
+            v = targets[i]
+            if finish[u] + weights[i] > start[v]:
+                start[v] = finish[u] + weights[i]
+                predecessor[v] = u
+
+    if not order:
+        return 0, []
+    v = max(order, key = lambda u: finish[u])
+    length = finish[v]
+    path = []
+    while v is not None:
+        path.append(v)
+        v = predecessor[v]
+    path.reverse()
+    return length, path
+
+
+def transitiveClosure(g):
+    # Row u is an int bitset of the vertices reachable from u
+    rows = [0] * g.size()
+    for u in g.ids():
+        for v, w in g.successors(u):
+            rows[u] |= 1 << v
+
+    for k in g.ids():
+        bit = 1 << k
+        rk = rows[k]
+        for u in g.ids():
+            if rows[u] & bit:
+                rows[u] |= rk
+    return rows
+
+
+if __name__ == '__main__':
+
+  edges = [ ("Zero", "One", 19), ("Zero", "Three", 14), ("Zero", "Four", 12), ("One", "Two", 20),
+            ("One", "Four", 18), ("Two", "Four", 17), ("Two", "Five", 15), ("Three", "Four", 13),
+            ("Three", "Six", 28), ("Four", "Five", 16), ("Four", "Six", 21), ("Six", "Five", 23) ]
+
+  for storage in ("dict", "csr", "bitmatrix"):
+      print("Storage :", storage)
+      d = fromEdges(edges, storage=storage)
+      s = d.index("Zero")
+
+      distance, predecessor = bfs(d, s)
+      print("BFS levels :", { d.name(u) : distance[u] for u in d.ids() })
+      print("DFS order :", [ d.name(u) for u in dfs(d, s) ])
+      distance, predecessor = dijkstra(d, s)
+      print("Dijkstra distances :", { d.name(u) : distance[u] for u in d.ids() })
+      print("Reachable from Two :", [ d.name(v) for v in bits(transitiveClosure(d)[d.index("Two")]) ])
+
+      print("Topological order :", [ d.name(u) for u in topologicalSort(d) ])
+      print("Topological levels :", [ [d.name(u) for u in level] for level in topologicalLevels(d) ])
+      length, path = criticalPath(d)
+      print("Critical path :", length, [ d.name(u) for u in path ])
+
+      u = fromEdges(edges, directed=False, storage=storage)
+      print("Prim weight :", sum(w for a, b, w in prim(u, u.index("Zero"))))
+      print("Kruskal weight :", sum(w for a, b, w in kruskal(u)))
+      print()
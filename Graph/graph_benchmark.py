@@ -0,0 +1,228 @@
+import json
+import platform
+import random
+import sys
+import time
+from math import isqrt
+from sys import maxsize as INFINITY
+
+from graph_core import STORAGES, Graph, bits
+from graph_algorithms import bfs, dfs, dijkstra, prim, kruskal, transitiveClosure
+
+
+# Benchmark of graph_algorithms over every graph_core storage on synthetic
+# graphs. Each generator returns (u, v, w) edges on the vertices 0..n-1
+# without self loops or repeated pairs, the same seed gives the same graph.
+# Results are written as JSON so runs can be compared over time. Besides
+# the sparse generators, Erdos-Renyi graphs are run over a range of edge
+# probabilities so the density where one storage overtakes another can be
+# read off
+#
+#   python graph_benchmark.py [output.json]
+
+
+def _weight(rng):
+    return rng.randint(1, 100)
+
+
+def erdosRenyi(n, averageDegree=8, seed=0, probability=None):
+    # G(n, m) with m = n * averageDegree edges drawn uniformly, or G(n, p)
+    # with every pair an edge with the given probability
+    rng = random.Random(seed)
+    if probability is not None:
+        return [ (u, v, _weight(rng)) for u in range(n) for v in range(n)
+                 if u != v and rng.random() < probability ]
+    m = min(n * averageDegree, n * (n-1))
+    pairs = set()
+    while len(pairs) < m:
+        u = rng.randrange(n)
+        v = rng.randrange(n)
+        if u != v:
+            pairs.add( (u,v) )
+    return [ (u, v, _weight(rng)) for u, v in sorted(pairs) ]
+
+
+def rmat(scale, edgeFactor=8, a=0.57, b=0.19, c=0.19, seed=0):
+    # R-MAT / Kronecker graph on 2^scale vertices, each edge picks one
+    # quadrant of the matrix per bit with probabilities a, b, c and
+    # 1-a-b-c, which gives the skewed degrees of real networks. Repeated
+    # pairs are dropped, so there are at most edgeFactor * 2^scale edges
+    rng = random.Random(seed)
+    pairs = set()
+    for e in range(edgeFactor << scale):
+        u = v = 0
+        for bit in range(scale):
+            r = rng.random()
+            if r < a:
+                pass
+            elif r < a + b:
+                v |= 1 << bit
+            elif r < a + b + c:
+                u |= 1 << bit
+            else:
+                u |= 1 << bit
+                v |= 1 << bit
+        if u != v:
+            pairs.add( (u,v) )
+    return [ (u, v, _weight(rng)) for u, v in sorted(pairs) ]
+
+
+def grid(rows, columns, seed=0):
+    # Every cell joined to the cell on its right and the one below
+    rng = random.Random(seed)
+    edges = []
+    for r in range(rows):
+        for c in range(columns):
+            u = r * columns + c
+            if c + 1 < columns:
+                edges.append( (u, u + 1, _weight(rng)) )
+            if r + 1 < rows:
+                edges.append( (u, u + columns, _weight(rng)) )
+    return edges
+
+
+def powerLaw(n, attach=4, seed=0):
+    # Barabasi-Albert preferential attachment, each new vertex is linked
+    # from attach earlier vertices chosen in proportion to their degree.
+    # The edges point from old to new so the early hubs reach the graph
+    rng = random.Random(seed)
+    ends = list(range(min(n, attach)))
+    edges = []
+    for u in range(attach, n):
+        chosen = set()
+        while len(chosen) < attach:
+            chosen.add( rng.choice(ends) )
+        for v in sorted(chosen):
+            edges.append( (v, u, _weight(rng)) )
+            ends.append(v)
+        ends.extend( [u] * attach )
+    return edges
+
+
+GENERATORS = {
+    "erdos-renyi" : lambda n, seed: erdosRenyi(n, seed=seed),
+    "rmat"        : lambda n, seed: rmat(n.bit_length() - 1, seed=seed),
+    "grid"        : lambda n, seed: grid(isqrt(n), isqrt(n), seed),
+    "power-law"   : lambda n, seed: powerLaw(n, seed=seed),
+}
+
+# Edge probabilities of the Erdos-Renyi density sweep and the sizes it is
+# run at, the densest graphs have about n^2 / 2 edges
+DENSITIES = (0.01, 0.05, 0.2, 0.5)
+DENSE_SIZES = (256, 1024)
+
+
+def _finite(distance):
+    return sum(1 for d in distance if d != INFINITY)
+
+
+# Each algorithm with whether it runs on the directed or the undirected
+# version of the graph, how it is called with the source vertex s and how
+# many vertices the run reached, None for Kruskal which covers the whole
+# graph. Warshall is O(V^2) big-int operations so it is only run up to
+# maxClosure vertices
+ALGORITHMS = {
+    "bfs"      : (True, lambda g, s: bfs(g, s), lambda result, s: _finite(result[0])),
+    "dfs"      : (True, lambda g, s: dfs(g, s), lambda result, s: len(result)),
+    "dijkstra" : (True, lambda g, s: dijkstra(g, s), lambda result, s: _finite(result[0])),
+    "warshall" : (True, lambda g, s: transitiveClosure(g), lambda result, s: len(list(bits(result[s] | 1 << s)))),
+    "prim"     : (False, lambda g, s: prim(g, s), lambda result, s: len(result) + 1),
+    "kruskal"  : (False, lambda g, s: kruskal(g), None),
+}
+
+
+def _timed(function, repeat):
+    # Best time of repeat runs and the result of the last one
+    best = None
+    for i in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best, result
+
+
+def _undirected(edges):
+    # Keeps the first of (u,v) and (v,u)
+    seen = set()
+    result = []
+    for u, v, w in edges:
+        if (v,u) not in seen:
+            seen.add( (u,v) )
+            result.append( (u, v, w) )
+    return result
+
+
+def _cases(sizes, generators, densities, denseSizes, seed):
+    for generatorName in generators:
+        for size in sizes:
+            yield generatorName, size, generators[generatorName](size, seed)
+    for probability in densities:
+        for size in denseSizes:
+            yield "erdos-renyi-p%g" % probability, size, erdosRenyi(size, seed=seed, probability=probability)
+
+
+def runBenchmark(sizes=(256, 1024, 4096), generators=GENERATORS, storages=STORAGES,
+                 algorithms=ALGORITHMS, densities=DENSITIES, denseSizes=DENSE_SIZES,
+                 repeat=3, maxClosure=2048, seed=0):
+    # Returns one record per graph, storage and algorithm with the best of
+    # repeat run times in seconds, the time to build the graph, its density
+    # and the number of vertices the run reached. Vertices are inserted in
+    # order so vertex u has id u. The single source algorithms start from
+    # the vertex of highest out-degree, so they do not measure a source
+    # that reaches nothing
+    results = []
+    for generatorName, size, edges in _cases(sizes, generators, densities, denseSizes, seed):
+        n = 1 + max( (max(u, v) for u, v, w in edges), default=0 )
+        for storage in storages:
+            graphs = {}
+            build = {}
+            for directed in (True, False):
+                start = time.perf_counter()
+                g = Graph(directed, storage)
+                g.insertVertices(range(n))
+                g.insertEdges(edges if directed else _undirected(edges))
+                g.csr()
+                build[directed] = time.perf_counter() - start
+                graphs[directed] = g
+
+            for algorithmName in algorithms:
+                directed, function, reached = algorithms[algorithmName]
+                if algorithmName == "warshall" and n > maxClosure:
+                    continue
+                g = graphs[directed]
+                outdegrees = g.outdegrees()
+                source = max(g.ids(), key = lambda u: outdegrees[u])
+                seconds, result = _timed(lambda: function(g, source), repeat)
+                results.append( {
+                    "generator" : generatorName,
+                    "storage" : storage,
+                    "size" : size,
+                    "vertices" : g.numVertices(),
+                    "edges" : g.numEdges(),
+                    "density" : g.numEdges() / (n * (n-1) if directed else n * (n-1) / 2) if n > 1 else 0,
+                    "directed" : directed,
+                    "algorithm" : algorithmName,
+                    "source" : source,
+                    "reached" : None if reached is None else reached(result, source),
+                    "build" : build[directed],
+                    "seconds" : seconds,
+                } )
+    return results
+
+
+def writeReport(results, fileName=None):
+    report = { "python" : platform.python_version(), "platform" : platform.platform(), "results" : results }
+    if fileName is None:
+        json.dump(report, sys.stdout, indent=1)
+        print()
+    else:
+        with open(fileName, "w") as f:
+            json.dump(report, f, indent=1)
+
+
+if __name__ == '__main__':
+
+  results = runBenchmark()
+  writeReport(results, sys.argv[1] if len(sys.argv) > 1 else None)
@@ -0,0 +1,466 @@
+from bisect import bisect_left
+
+
+def bits(row):
+    # Indices of the set bits of an int bitset, lowest first
+    while row:
+        low = row & -row
+        yield low.bit_length() - 1
+        row ^= low
+
+
+class DictStorage:
+
+        # Dict of dicts, _succ[u][v] is the weight of edge (u,v).
+        # Suits sparse graphs that are changed often
+        def __init__(self):
+            self._succ = []
+            self._pred = []
+
+
+        def addVertex(self):
+            self._succ.append({})
+            self._pred.append({})
+
+
+        def addEdge(self, u, v, w):
+            self._succ[u][v] = w
+            self._pred[v][u] = w
+
+
+        def removeEdge(self, u, v):
+            del self._succ[u][v]
+            del self._pred[v][u]
+
+
+        def hasEdge(self, u, v):
+            return v in self._succ[u]
+
+
+        def weight(self, u, v):
+            return self._succ[u].get(v)
+
+
+        def successors(self, u):
+            return self._succ[u].items()
+
+
+        def predecessors(self, u):
+            return self._pred[u].items()
+
+
+class CSRStorage:
+
+        # Compressed sparse row arrays, the out-edges of u are
+        # targets[offsets[u]:offsets[u+1]] sorted by target.
+        # Suits large graphs that are mostly read, writes are buffered and
+        # merged into the arrays by one O(V+E) rebuild on the next read
+        def __init__(self):
+            self._n = 0
+            self._offsets = [0]
+            self._targets = []
+            self._weights = []
+            self._added = {}
+            self._deleted = set()
+            self._reverse = None
+
+
+        def addVertex(self):
+            self._n += 1
+            self._offsets.append(self._offsets[-1])
+            self._reverse = None
+
+
+        def addEdge(self, u, v, w):
+            if (u,v) in self._deleted:
+                # Removed since the last merge, so it is still in the arrays
+                # and is brought back there with the new weight
+                self._deleted.discard( (u,v) )
+                self._weights[self._find(u, v)] = w
+            else:
+                self._added[(u,v)] = w
+            self._reverse = None
+
+
+        def removeEdge(self, u, v):
+            if self._added.pop( (u,v), None ) is None:
+                self._deleted.add( (u,v) )
+            self._reverse = None
+
+
+        def _find(self, u, v):
+            lo = self._offsets[u]
+            hi = self._offsets[u+1]
+            i = bisect_left(self._targets, v, lo, hi)
+            if i < hi and self._targets[i] == v:
+                return i
+            return None
+
+
+        def hasEdge(self, u, v):
+            return self.weight(u, v) is not None
+
+
+        def weight(self, u, v):
+            if (u,v) in self._added:
+                return self._added[(u,v)]
+            if (u,v) in self._deleted:
+                return None
+            i = self._find(u, v)
+            return None if i is None else self._weights[i]
+
+
+        def _merge(self):
+            rows = [ [] for u in range(self._n) ]
+            for u in range(self._n):
+                for i in range(self._offsets[u], self._offsets[u+1]):
+                    if (u, self._targets[i]) not in self._deleted:
+                        rows[u].append( (self._targets[i], self._weights[i]) )
+            for (u,v), w in self._added.items():
+                rows[u].append( (v,w) )
+
+            self._offsets = [0]
+            self._targets = []
+            self._weights = []
+            for row in rows:
+                row.sort()
+                for v, w in row:
+                    self._targets.append(v)
+                    self._weights.append(w)
+                self._offsets.append(len(self._targets))
+            self._added = {}
+            self._deleted = set()
+
+
+        def csr(self):
+            if self._added or self._deleted:
+                self._merge()
+            return self._offsets, self._targets, self._weights
+
+
+        def successors(self, u):
+            offsets, targets, weights = self.csr()
+            a = offsets[u]
+            b = offsets[u+1]
+            return zip(targets[a:b], weights[a:b])
+
+
+        def predecessors(self, u):
+            if self._reverse is None:
+                offsets, targets, weights = self.csr()
+                self._reverse = [ [] for v in range(self._n) ]
+                for x in range(self._n):
+                    for i in range(offsets[x], offsets[x+1]):
+                        self._reverse[targets[i]].append( (x, weights[i]) )
+            return self._reverse[u]
+
+
+class BitMatrixStorage:
+
+        # Dense adjacency matrix with one bit per cell, row u is an int
+        # bitset of the successors of u and column v one of its predecessors.
+        # Weights other than 1 are kept on the side.
+        # Suits dense graphs, a 10k vertex graph needs about 12 MB per matrix
+        def __init__(self):
+            self._rows = []
+            self._cols = []
+            self._weights = {}
+
+
+        def addVertex(self):
+            self._rows.append(0)
+            self._cols.append(0)
+
+
+        def addEdge(self, u, v, w):
+            self._rows[u] |= 1 << v
+            self._cols[v] |= 1 << u
+            if w != 1:
+                self._weights[(u,v)] = w
+
+
+        def removeEdge(self, u, v):
+            self._rows[u] &= ~(1 << v)
+            self._cols[v] &= ~(1 << u)
+            self._weights.pop( (u,v), None )
+
+
+        def hasEdge(self, u, v):
+            return (self._rows[u] >> v) & 1 == 1
+
+
+        def weight(self, u, v):
+            if not self.hasEdge(u, v):
+                return None
+            return self._weights.get( (u,v), 1 )
+
+
+        def successors(self, u):
+            return [ (v, self._weights.get( (u,v), 1 )) for v in bits(self._rows[u]) ]
+
+
+        def predecessors(self, v):
+            return [ (u, self._weights.get( (u,v), 1 )) for u in bits(self._cols[v]) ]
+
+
+        def row(self, u):
+            return self._rows[u]
+
+
+STORAGES = { "dict" : DictStorage, "csr" : CSRStorage, "bitmatrix" : BitMatrixStorage }
+
+
+class Graph:
+
+        # One graph class for all storages. Vertices get integer ids in the
+        # order they are inserted, removed vertices leave a tombstone id.
+        # Edge count and in/out-degrees are maintained on every change
+        def __init__(self, directed=True, storage="dict"):
+            if storage not in STORAGES:
+                raise ValueError("Unknown storage " + repr(storage))
+            self._directed = directed
+            self._storageName = storage
+            self._storage = STORAGES[storage]()
+            self._names = []
+            self._index = {}
+            self._outdeg = []
+            self._indeg = []
+            self._m = 0
+            self._removed = 0
+
+
+        def isDirected(self):
+            return self._directed
+
+
+        def storage(self):
+            return self._storageName
+
+
+        def display(self):
+            for u in self.ids():
+                print( self._names[u], " - > ", [ (self._names[v], w) for v, w in self._storage.successors(u) ] )
+            print()
+
+
+        def numVertices(self):
+            return len(self._names) - self._removed
+
+
+        def numEdges(self):
+            return self._m
+
+
+        def vertices(self):
+            return [name for name in self._names if name is not None]
+
+
+        def edges(self):
+            edgesList = []
+            for u in self.ids():
+                for v, w in self._storage.successors(u):
+                    if self._directed or u < v:
+                        edgesList.append( (self._names[u], self._names[v], w) )
+            return edgesList
+
+
+        def size(self):
+            return len(self._names)
+
+
+        def ids(self):
+            return [u for u in range(len(self._names)) if self._names[u] is not None]
+
+
+        def index(self, s):
+            return self._index.get(s)
+
+
+        def name(self, u):
+            return self._names[u]
+
+
+        def insertVertex(self, name):
+            if name in self._index:
+                print("Vertex with this name already present in the graph")
+                return
+
+            self._index[name] = len(self._names)
+            self._names.append(name)
+            self._outdeg.append(0)
+            self._indeg.append(0)
+            self._storage.addVertex()
+
+
+        def insertVertices(self, names):
+            for name in names:
+                self.insertVertex(name)
+
+
+        def removeVertex(self, name):
+            u = self._index.get(name)
+            if u is None:
+                print("Vertex not present in the graph")
+                return
+
+            for v, w in list(self._storage.successors(u)):
+                self._removeEdge(u, v)
+            if self._directed:
+                for v, w in list(self._storage.predecessors(u)):
+                    self._removeEdge(v, u)
+
+            self._names[u] = None
+            del self._index[name]
+            self._removed += 1
+
+
+        def insertEdge(self, s1, s2, w=1):
+            u = self._index.get(s1)
+            v = self._index.get(s2)
+            if u is None:
+                print("Start vertex not present in the graph, first insert the start vertex")
+            elif v is None:
+                print("End vertex not present in the graph, first insert the end vertex")
+            elif u == v:
+                print("Not a valid edge")
+            elif self._storage.hasEdge(u, v):
+                print("Edge already present in the graph")
+            else:
+                self._storage.addEdge(u, v, w)
+                self._outdeg[u] += 1
+                self._indeg[v] += 1
+                if not self._directed:
+                    self._storage.addEdge(v, u, w)
+                    self._outdeg[v] += 1
+                    self._indeg[u] += 1
+                self._m += 1
+
+
+        def insertEdges(self, edges):
+            for edge in edges:
+                self.insertEdge(*edge)
+
+
+        def _removeEdge(self, u, v):
+            self._storage.removeEdge(u, v)
+            self._outdeg[u] -= 1
+            self._indeg[v] -= 1
+            if not self._directed:
+                self._storage.removeEdge(v, u)
+                self._outdeg[v] -= 1
+                self._indeg[u] -= 1
+            self._m -= 1
+
+
+        def removeEdge(self, s1, s2):
+            u = self._index.get(s1)
+            v = self._index.get(s2)
+            if u is None:
+                print("Start vertex not present in the graph")
+            elif v is None:
+                print("End vertex not present in the graph")
+            elif not self._storage.hasEdge(u, v):
+                print("Edge not present in the graph")
+            else:
+                self._removeEdge(u, v)
+
+
+        def isAdjacent(self, s1, s2):
+            u = self._index.get(s1)
+            v = self._index.get(s2)
+            if u is None:
+                print("Start vertex not present in the graph")
+                return False
+            elif v is None:
+                print("End vertex not present in the graph")
+                return False
+            return self._storage.hasEdge(u, v)
+
+
+        def outdegree(self, s):
+            u = self._index.get(s)
+            if u is None:
+                print("Vertex not present in the graph")
+                return
+            return self._outdeg[u]
+
+
+        def indegree(self, s):
+            u = self._index.get(s)
+            if u is None:
+                print("Vertex not present in the graph")
+                return
+            return self._indeg[u]
+
+
+        def degree(self, s):
+            return self.outdegree(s)
+
+
+        # Integer id interface used by the algorithms
+
+        def hasEdge(self, u, v):
+            return self._storage.hasEdge(u, v)
+
+
+        def weight(self, u, v):
+            return self._storage.weight(u, v)
+
+
+        def successors(self, u):
+            return self._storage.successors(u)
+
+
+        def predecessors(self, u):
+            if not self._directed:
+                return self._storage.successors(u)
+            return self._storage.predecessors(u)
+
+
+        def outdegrees(self):
+            return self._outdeg
+
+
+        def indegrees(self):
+            return self._indeg
+
+
+        def csr(self):
+            # (offsets, targets, weights) over all ids, the arrays of a CSR
+            # storage are returned as they are, other storages are copied
+            if self._storageName == "csr":
+                return self._storage.csr()
+            offsets = [0]
+            targets = []
+            weights = []
+            for u in range(len(self._names)):
+                for v, w in sorted(self._storage.successors(u)):
+                    targets.append(v)
+                    weights.append(w)
+                offsets.append(len(targets))
+            return offsets, targets, weights
+
+
+def fromEdges(edges, directed=True, storage="dict"):
+    # Builds a graph from (s1, s2) or (s1, s2, w) tuples, vertices are
+    # inserted the first time they are seen
+    g = Graph(directed, storage)
+    for edge in edges:
+        for name in edge[:2]:
+            if g.index(name) is None:
+                g.insertVertex(name)
+        g.insertEdge(*edge)
+    return g
+
+
+if __name__ == '__main__':
+
+  for storage in STORAGES:
+      g = fromEdges( [ ("AA","BB",4), ("AA","CC",2), ("CC","DD",7), ("DD","AA",1), ("BB","EE",3) ], storage=storage )
+      print("Storage :", storage)
+      g.display()
+      print("Number of edges : ", g.numEdges())
+      print("Indegree of AA :", g.indegree("AA"), " Outdegree of AA :", g.outdegree("AA"))
+      g.removeVertex("CC")
+      print("Edges after removing CC : ", g.edges())
+      print()
@@ -1,5 +1,41 @@
 
 
+from heapq import heapify, heappop
+
+
+class DisjointSet:
+
+        def __init__(self, n):
+           self._parent = list(range(n))
+           self._rank = [0] * n
+
+
+        def find(self, v):
+           root = v
+           while self._parent[root] != root:
+                root = self._parent[root]
+
+           # Path compression
+           while self._parent[v] != root:
+                self._parent[v], v = root, self._parent[v]
+           return root
+
+
+        def union(self, u, v):
+           r1 = self.find(u)
+           r2 = self.find(v)
+           if r1 == r2:
+                return False
+
+           # Union by rank
+           if self._rank[r1] < self._rank[r2]:
+                r1, r2 = r2, r1
+           self._parent[r2] = r1
+           if self._rank[r1] == self._rank[r2]:
+                self._rank[r1] += 1
+           return True
+
+
 class Vertex:
         def __init__(self, name):
            self.name = name
@@ -11,6 +47,7 @@ class UndirectedWeightedGraph:
            self._adj = [  [0 for column in range(size)]  for row in range(size) ]
            self._n = 0
            self._vertexList = []
+           self._index = {}
            
 
         def display(self):
@@ -47,22 +84,36 @@ class UndirectedWeightedGraph:
 
 
         def _getIndex(self,s):
-            index = 0
-            for name in (vertex.name for vertex in self._vertexList):
-                if s == name:
-                   return index
-                index += 1
-            return None
+            return self._index.get(s)
+
+
+        def _grow(self):
+             # Double the capacity so that a run of insertions costs
+             # amortized O(V) per vertex
+             capacity = max(1, 2*len(self._adj))
+             for row in self._adj:
+                  row.extend( [0] * (capacity - len(row)) )
+             for i in range(capacity - len(self._adj)):
+                  self._adj.append( [0] * capacity )
 
 
         def insertVertex(self,name):
-            if name in (vertex.name for vertex in self._vertexList): ######## 
+            if name in self._index:
                 print("Vertex with this name already present in the graph")
                 return                
+            if self._n == len(self._adj):
+                self._grow()
+
+            self._index[name] = self._n
             self._vertexList.append( Vertex(name) )  
             self._n += 1
 
 
+        def insertVertices(self, names):
+            for name in names:
+                self.insertVertex(name)
+
+
         def removeVertex(self,name):
              u = self._getIndex(name)
              if u is None:
@@ -71,10 +122,13 @@ class UndirectedWeightedGraph:
         
              self._adj.pop(u)
 
-             for i in range(self._n):
-                  self._adj[i].pop(u)
+             for row in self._adj:
+                  row.pop(u)
                   
              self._vertexList.pop(u)
+             del self._index[name]
+             for i in range(u, self._n-1):
+                  self._index[self._vertexList[i].name] = i
              self._n -= 1
                
     
@@ -94,6 +148,12 @@ class UndirectedWeightedGraph:
                 self._adj[v][u] = w
                 
         
+
+        def insertEdges(self, edges):
+            for s1, s2, w in edges:
+                self.insertEdge(s1, s2, w)
+
+
         def removeEdge(self, s1,s2):
              u = self._getIndex(s1)
              v = self._getIndex(s2)
@@ -133,49 +193,41 @@ class UndirectedWeightedGraph:
             return deg
 
 
-        def kruskals(self):
+        def minimumSpanningTree(self):
+           # Each undirected edge is taken once from the upper triangle
            edgesList = []
-
            for u in range(self._n):
-              for v in range(self._n):
-                 if self._adj[u][v] != 0:
-                    edgesList.append( (u,v,self._adj[u][v]) )
-                        
+              row = self._adj[u]
+              for v in range(u+1, self._n):
+                 if row[v] != 0:
+                    edgesList.append( (row[v], u, v) )
 
-           edgesList = sorted(edgesList, key = lambda item: item[2], reverse = True)  
-           
-           for v in range(self._n):
-              self._vertexList[v].father = None
-           
-           r1 = None
-           r2 = None
-           edgesInTree = 0  
-           wtTree = 0
-           
-           while len(edgesList)!=0  and edgesInTree < self._n-1 :
-                edge = edgesList.pop()
-                v1 = edge[0]
-                v2 = edge[1]
-                        
-                v = v1
-                while self._vertexList[v].father != None :
-                     v = self._vertexList[v].father
-                r1 = v
-                    
-                v = v2
-                while self._vertexList[v].father!=None :
-                      v = self._vertexList[v].father
-                r2 = v
-
-                if r1 != r2 :  #Edge (v1,v2) is included
-                    edgesInTree += 1
-                    print(self._vertexList[v1].name , "->"  , self._vertexList[v2].name ) 
-                    wtTree += edge[2]
-                    self._vertexList[r2].father = r1
-                         
-           if edgesInTree < self._n-1:
+           # Heapify is O(E), edges are then popped lazily so the work stops
+           # as soon as the tree has n-1 edges
+           heapify(edgesList)
+
+           ds = DisjointSet(self._n)
+           tree = []
+           while len(edgesList) != 0 and len(tree) < self._n-1 :
+                w, v1, v2 = heappop(edgesList)
+                if ds.union(v1, v2):  #Edge (v1,v2) is included
+                    tree.append( (self._vertexList[v1].name, self._vertexList[v2].name, w) )
+
+           if len(tree) < self._n-1:
+                 return None
+           return tree
+
+
+        def kruskals(self):
+           tree = self.minimumSpanningTree()
+           if tree is None:
                  print("Graph is not connected, no spanning tree possible")
                  return
+
+           wtTree = 0
+           for v1, v2, w in tree:
+                print(v1 , "->"  , v2 )
+                wtTree += w
                         
            print("Weight of Minimum Spanning Tree is " , wtTree)
             
@@ -1,4 +1,5 @@
 
+import sys
 
 class Vertex:
         def __init__(self, name):
@@ -11,6 +12,7 @@ class DirectedGraph:
            self._adj = [  [0 for column in range(size)]  for row in range(size) ]
            self._n = 0
            self._vertexList = []
+           self._index = {}
            
 
         def display(self):
@@ -47,22 +49,36 @@ class DirectedGraph:
 
 
         def _getIndex(self,s):
-            index = 0
-            for name in (vertex.name for vertex in self._vertexList):
-                if s == name:
-                   return index
-                index += 1
-            return None
+            return self._index.get(s)
+
+
+        def _grow(self):
+             # Double the capacity so that a run of insertions costs
+             # amortized O(V) per vertex
+             capacity = max(1, 2*len(self._adj))
+             for row in self._adj:
+                  row.extend( [0] * (capacity - len(row)) )
+             for i in range(capacity - len(self._adj)):
+                  self._adj.append( [0] * capacity )
 
 
         def insertVertex(self,name):
-            if name in (vertex.name for vertex in self._vertexList): ######## 
+            if name in self._index:
                 print("Vertex with this name already present in the graph")
                 return                
+            if self._n == len(self._adj):
+                self._grow()
+
+            self._index[name] = self._n
             self._vertexList.append( Vertex(name) )  
             self._n += 1
 
 
+        def insertVertices(self, names):
+            for name in names:
+                self.insertVertex(name)
+
+
         def removeVertex(self,name):
              u = self._getIndex(name)
              if u is None:
@@ -71,10 +87,13 @@ class DirectedGraph:
         
              self._adj.pop(u)
 
-             for i in range(self._n):
-                  self._adj[i].pop(u)
+             for row in self._adj:
+                  row.pop(u)
                   
              self._vertexList.pop(u)
+             del self._index[name]
+             for i in range(u, self._n-1):
+                  self._index[self._vertexList[i].name] = i
              self._n -= 1
                
     
@@ -93,6 +112,12 @@ class DirectedGraph:
                 self._adj[u][v] = 1
                 
         
+
+        def insertEdges(self, edges):
+            for s1, s2 in edges:
+                self.insertEdge(s1, s2)
+
+
         def removeEdge(self, s1,s2):
              u = self._getIndex(s1)
              v = self._getIndex(s2)
@@ -144,7 +169,57 @@ class DirectedGraph:
                     ind+=1
             return ind
 
-        def findPathMatrix(self):
+
+        def _bitRows(self):
+            rows = [0] * self._n
+            for i in range(self._n):
+                row = self._adj[i]
+                for j in range(self._n):
+                   if row[j] != 0:
+                      rows[i] |= 1 << j
+            return rows
+
+
+        def pathMatrix(self):
+            # Boolean matrices are kept as one int bitset per row, so row i of
+            # a product X.Y is the OR of the rows k of Y for every bit k of X[i]
+            a = self._bitRows()
+
+            # M = (I + A) squared until it covers walks of length n-1
+            m = [a[i] | (1 << i) for i in range(self._n)]
+            length = 1
+            while length < self._n - 1:
+                m = _boolProduct(m, m)
+                length *= 2
+
+            # A.(I + A)^(n-1) holds the walks of length 1 to n
+            p = _boolProduct(a, m)
+            return [ [ (p[i] >> j) & 1 for j in range(self._n) ] for i in range(self._n) ]
+
+
+        def walkCounts(self, k):
+            # Number of walks of length 1 to k from i to j, that is
+            # A + A^2 + ... + A^k, using O(log k) matrix products.
+            # Python ints are arbitrary precision so the counts never overflow
+            a = [ [ 1 if self._adj[i][j] != 0 else 0 for j in range(self._n) ] for i in range(self._n) ]
+            s = [ [0] * self._n for i in range(self._n) ]
+            p = [ [ 1 if i == j else 0 for j in range(self._n) ] for i in range(self._n) ]
+
+            # (s, p) = (A + ... + A^m, A^m) for the bits of k consumed so far,
+            # sa, pa the same pair for the current power of two
+            sa, pa = a, a
+            while k > 0:
+                if k & 1:
+                    s = _matrixSum(s, _matrixProduct(p, sa))
+                    p = _matrixProduct(p, pa)
+                k >>= 1
+                if k:
+                    sa = _matrixSum(sa, _matrixProduct(pa, sa))
+                    pa = _matrixProduct(pa, pa)
+            return s
+
+
+        def _powerSumLoop(self):
                              
             x = [ [None for column in range(self._n)]  for row in range(self._n) ]
             
@@ -170,8 +245,13 @@ class DirectedGraph:
                for i in range(self._n):
                    for j in range(self._n):
                         x[i][j] = x[i][j] + adjp[i][j]
-                
-           
+
+            return x
+
+
+        def findPathMatrix(self):
+            x = self.walkCounts(self._n)
+
             #Display x
             for i in range(self._n):
                for j in range(self._n):
@@ -179,20 +259,64 @@ class DirectedGraph:
                print()
                 
             print()      
-      
-            
-            for i in range(self._n):
-                for j in range(self._n):
-                   if x[i][j] != 0:
-                       x[i][j] = 1
-                   
+
+            p = self.pathMatrix()
+
             #Display Path Matrix
             for i in range(self._n):
                for j in range(self._n):
-                   print(x[i][j],end=" ")
+                   print(p[i][j],end=" ")
                print()
           
 
+def _boolProduct(x, y):
+    z = []
+    for row in x:
+        r = 0
+        while row:
+            low = row & -row
+            r |= y[low.bit_length() - 1]
+            row ^= low
+        z.append(r)
+    return z
+
+
+def _matrixProduct(x, y):
+    columns = list(zip(*y))
+    return [ [ sum(a*b for a, b in zip(row, column)) for column in columns ] for row in x ]
+
+
+def _matrixSum(x, y):
+    return [ [ a + b for a, b in zip(rx, ry) ] for rx, ry in zip(x, y) ]
+
+
+def crossoverBenchmark(sizes=(8, 16, 32, 64), density=0.1):
+    # Times the original power-sum loop against the bitset path matrix on
+    # random graphs, the loop is O(V^4) so keep the sizes small
+    import random
+    import time
+
+    print("Vertices   Power-sum loop   Repeated squaring")
+    for n in sizes:
+        g = DirectedGraph(n)
+        g.insertVertices(range(n))
+        for u in range(n):
+            for v in range(n):
+                if u != v and random.random() < density:
+                    g.insertEdge(u, v)
+
+        start = time.perf_counter()
+        x = g._powerSumLoop()
+        loop = time.perf_counter() - start
+
+        start = time.perf_counter()
+        p = g.pathMatrix()
+        squaring = time.perf_counter() - start
+
+        assert p == [ [ 1 if c != 0 else 0 for c in row ] for row in x ]
+        print("%8d   %13.4fs   %16.4fs" % (n, loop, squaring))
+
+
 if __name__ == '__main__':
 
   g1 = DirectedGraph() 
@@ -228,5 +352,5 @@ if __name__ == '__main__':
 
   print()
 
-
-   
+  if "--benchmark" in sys.argv:
+      crossoverBenchmark()
@@ -2,8 +2,85 @@
 
 from sys import maxsize as INFINITY
 
-TEMPORARY = 1
-PERMANENT = 2
+class SpanningTree:
+        def __init__(self, root, edges, weight):
+           self.root = root
+           self.edges = edges
+           self.weight = weight
+
+
+class IndexedMinHeap:
+
+        # Binary heap of the vertices 0..n-1 keyed by their current length,
+        # _pos[v] is the slot of v in _heap so its key can be decreased in place
+        def __init__(self, n):
+           self._heap = []
+           self._key = [None] * n
+           self._pos = [None] * n
+
+
+        def __len__(self):
+            return len(self._heap)
+
+
+        def pushOrDecrease(self, v, key):
+            if self._pos[v] is None:
+                self.push(v, key)
+            elif key < self._key[v]:
+                self._key[v] = key
+                self._siftUp(self._pos[v])
+
+
+        def push(self, v, key):
+            self._key[v] = key
+            self._pos[v] = len(self._heap)
+            self._heap.append(v)
+            self._siftUp(len(self._heap) - 1)
+
+
+        def pop(self):
+            top = self._heap[0]
+            last = self._heap.pop()
+            if self._heap:
+                self._heap[0] = last
+                self._pos[last] = 0
+                self._siftDown(0)
+            self._pos[top] = None
+            return top
+
+
+        def _siftUp(self, i):
+            heap, key, pos = self._heap, self._key, self._pos
+            v = heap[i]
+            while i > 0:
+                parent = (i - 1) // 2
+                if key[heap[parent]] <= key[v]:
+                    break
+                heap[i] = heap[parent]
+                pos[heap[i]] = i
+                i = parent
+            heap[i] = v
+            pos[v] = i
+
+
+        def _siftDown(self, i):
+            heap, key, pos = self._heap, self._key, self._pos
+            n = len(heap)
+            v = heap[i]
+            while True:
+                child = 2*i + 1
+                if child >= n:
+                    break
+                if child + 1 < n and key[heap[child+1]] < key[heap[child]]:
+                    child += 1
+                if key[v] <= key[heap[child]]:
+                    break
+                heap[i] = heap[child]
+                pos[heap[i]] = i
+                i = child
+            heap[i] = v
+            pos[v] = i
+
 
 class Vertex:
         def __init__(self, name):
@@ -16,6 +93,8 @@ class UndirectedWeightedGraph:
            self._adj = [  [0 for column in range(size)]  for row in range(size) ]
            self._n = 0
            self._vertexList = []
+           self._index = {}
+           self._adjList = None
            
 
         def display(self):
@@ -52,20 +131,35 @@ class UndirectedWeightedGraph:
 
 
         def _getIndex(self,s):
-            index = 0
-            for name in (vertex.name for vertex in self._vertexList):
-                if s == name:
-                   return index
-                index += 1
-            return None
+            return self._index.get(s)
+
+
+        def _grow(self):
+             # Double the capacity so that a run of insertions costs
+             # amortized O(V) per vertex
+             capacity = max(1, 2*len(self._adj))
+             for row in self._adj:
+                  row.extend( [0] * (capacity - len(row)) )
+             for i in range(capacity - len(self._adj)):
+                  self._adj.append( [0] * capacity )
 
 
         def insertVertex(self,name):
-            if name in (vertex.name for vertex in self._vertexList): ######## 
+            if name in self._index:
                 print("Vertex with this name already present in the graph")
                 return                
+            if self._n == len(self._adj):
+                self._grow()
+
+            self._index[name] = self._n
             self._vertexList.append( Vertex(name) )  
             self._n += 1
+            self._adjList = None
+
+
+        def insertVertices(self, names):
+            for name in names:
+                self.insertVertex(name)
 
 
         def removeVertex(self,name):
@@ -76,11 +170,15 @@ class UndirectedWeightedGraph:
         
              self._adj.pop(u)
 
-             for i in range(self._n):
-                  self._adj[i].pop(u)
+             for row in self._adj:
+                  row.pop(u)
                   
              self._vertexList.pop(u)
+             del self._index[name]
+             for i in range(u, self._n-1):
+                  self._index[self._vertexList[i].name] = i
              self._n -= 1
+             self._adjList = None
                
     
         def insertEdge(self, s1, s2, w):
@@ -97,8 +195,15 @@ class UndirectedWeightedGraph:
             else:  
                 self._adj[u][v] = w
                 self._adj[v][u] = w
+                self._adjList = None
                 
         
+
+        def insertEdges(self, edges):
+            for s1, s2, w in edges:
+                self.insertEdge(s1, s2, w)
+
+
         def removeEdge(self, s1,s2):
              u = self._getIndex(s1)
              v = self._getIndex(s2)
@@ -111,6 +216,7 @@ class UndirectedWeightedGraph:
              else:        
                 self._adj[u][v] = 0
                 self._adj[v][u] = 0
+                self._adjList = None
 
 
         def isAdjacent(self, s1, s2):
@@ -138,52 +244,69 @@ class UndirectedWeightedGraph:
                      deg += 1
             return deg
 
-        def prims(self):
-            edgesInTree = 0
-            wtTree = 0
-                            
-            for v in range(self._n):
-                 self._vertexList[v].status = TEMPORARY
-                 self._vertexList[v].length = INFINITY
-                 self._vertexList[v].predecessor = None
+        def adjacencyLists(self):
+            if self._adjList is None:
+                self._adjList = []
+                for u in range(self._n):
+                    row = self._adj[u]
+                    self._adjList.append( [ (v, row[v]) for v in range(self._n) if row[v] != 0 ] )
+            return self._adjList
 
-            root = 0
-            self._vertexList[root].length = 0
-                
-            while True:
-                c = self._tempVertexMinL()
-        
-                if c == None:
-                     if edgesInTree == self._n-1:
-                          print("Weight of minimum spanning tree is", wtTree)
-                     else:
-                          print("Graph is not connected, Spanning tree not possible")
-                     return         
-                
-                self._vertexList[c].status = PERMANENT
-                        
-                # Include edge ( self._vertexList[c].predecessor,c ) in the tree
-                if c != root:
-                     edgesInTree += 1
-                     print("(", self._vertexList[c].predecessor, "," ,c, ")")
-                     wtTree = wtTree + self._adj[self._vertexList[c].predecessor][c]
-                        
-                for v in range(self._n):
-                   if self._adj[c][v] and self._vertexList[v].status == TEMPORARY:
-                        if self._adj[c][v] < self._vertexList[v].length:
-                            self._vertexList[v].length = self._adj[c][v]
-                            self._vertexList[v].predecessor = c
-                        
-
-        def _tempVertexMinL(self):
-            min = INFINITY
-            x = None
-        
-            for v in range(self._n):
-               if self._vertexList[v].status == TEMPORARY and self._vertexList[v].length < min :
-                   min = self._vertexList[v].length
-                   x = v
-            return x
+
+        def minimumSpanningTree(self, root=None):
+            if self._n == 0:
+                 return SpanningTree(None, [], 0)
+
+            if root is None:
+                 r = 0
+            else:
+                 r = self._getIndex(root)
+                 if r is None:
+                      print("Vertex not present in the graph")
+                      return
+
+            adjList = self.adjacencyLists()
+            length = [INFINITY] * self._n
+            predecessor = [None] * self._n
+            inTree = [False] * self._n
+
+            heap = IndexedMinHeap(self._n)
+            length[r] = 0
+            heap.push(r, 0)
+
+            edges = []
+            wtTree = 0
+            while len(heap) != 0:
+                c = heap.pop()
+                inTree[c] = True
+
+                # Include edge ( predecessor[c],c ) in the tree
+                if c != r:
+                     p = predecessor[c]
+                     edges.append( (self._vertexList[p].name, self._vertexList[c].name, length[c]) )
+                     wtTree += length[c]
+
+                for v, w in adjList[c]:
+                     if not inTree[v] and w < length[v]:
+                          length[v] = w
+                          predecessor[v] = c
+                          heap.pushOrDecrease(v, w)
+
+            if len(edges) != self._n-1:
+                 return None
+            return SpanningTree(self._vertexList[r].name, edges, wtTree)
+
+
+        def prims(self, root=None):
+            tree = self.minimumSpanningTree(root)
+            if tree is None:
+                 if root is None or self._getIndex(root) is not None:
+                      print("Graph is not connected, Spanning tree not possible")
+                 return
+
+            for u, v, w in tree.edges:
+                 print("(", self._getIndex(u), "," , self._getIndex(v), ")")
+            print("Weight of minimum spanning tree is", tree.weight)
         
 
 if __name__ == '__main__':
@@ -5,12 +5,61 @@ class Vertex:
            self.name = name
 
           
+def _bits(row):
+    # Indices of the set bits of an int bitset, lowest first
+    while row:
+        low = row & -row
+        yield low.bit_length() - 1
+        row ^= low
+
+
+class Reachability:
+
+        def __init__(self, names, rows):
+            self._names = names
+            self._index = { name : i for i, name in enumerate(names) }
+            self._rows = rows
+
+
+        def reaches(self, s1, s2):
+            u = self._index.get(s1)
+            v = self._index.get(s2)
+            if u is None:
+                print("Start vertex not present in the graph")
+                return False
+            elif v is None:
+                print("End vertex not present in the graph")
+                return False
+            return (self._rows[u] >> v) & 1 == 1
+
+
+        def reachableFrom(self, s):
+            u = self._index.get(s)
+            if u is None:
+               print("Vertex not present in the graph")
+               return
+
+            return [ self._names[v] for v in _bits(self._rows[u]) ]
+
+
+        def pathMatrix(self):
+            n = len(self._names)
+            return [ [ (self._rows[i] >> j) & 1 for j in range(n) ] for i in range(n) ]
+
+
 class DirectedGraph:
 
-        def __init__(self,size=20):
+        def __init__(self,size=20,incremental=False):
            self._adj = [  [0 for column in range(size)]  for row in range(size) ]
            self._n = 0
            self._vertexList = []
+           self._index = {}
+           # With incremental the closure is kept up to date as edges are
+           # inserted, _reach[u] and _reachedBy[u] are bitsets of the vertices
+           # u reaches and of those reaching u. None means it must be rebuilt
+           self._incremental = incremental
+           self._reach = [] if incremental else None
+           self._reachedBy = [] if incremental else None
            
 
         def display(self):
@@ -47,21 +96,38 @@ class DirectedGraph:
 
 
         def _getIndex(self,s):
-            index = 0
-            for name in (vertex.name for vertex in self._vertexList):
-                if s == name:
-                   return index
-                index += 1
-            return None
+            return self._index.get(s)
+
+
+        def _grow(self):
+             # Double the capacity so that a run of insertions costs
+             # amortized O(V) per vertex
+             capacity = max(1, 2*len(self._adj))
+             for row in self._adj:
+                  row.extend( [0] * (capacity - len(row)) )
+             for i in range(capacity - len(self._adj)):
+                  self._adj.append( [0] * capacity )
 
 
         def insertVertex(self,name):
-            if name in (vertex.name for vertex in self._vertexList): ######## 
+            if name in self._index:
                 print("Vertex with this name already present in the graph")
                 return
                 
+            if self._n == len(self._adj):
+                self._grow()
+
+            self._index[name] = self._n
             self._vertexList.append( Vertex(name) )  
             self._n += 1
+            if self._reach is not None:
+                self._reach.append(0)
+                self._reachedBy.append(0)
+
+
+        def insertVertices(self, names):
+            for name in names:
+                self.insertVertex(name)
 
 
         def removeVertex(self,name):
@@ -72,11 +138,15 @@ class DirectedGraph:
         
              self._adj.pop(u)
 
-             for i in range(self._n):
-                  self._adj[i].pop(u)
+             for row in self._adj:
+                  row.pop(u)
                   
              self._vertexList.pop(u)
+             del self._index[name]
+             for i in range(u, self._n-1):
+                  self._index[self._vertexList[i].name] = i
              self._n -= 1
+             self._reach = None
                
     
         def insertEdge(self, s1, s2):
@@ -92,8 +162,16 @@ class DirectedGraph:
                 print("Edge already present in the graph") 
             else:  
                 self._adj[u][v] = 1
+                if self._reach is not None:
+                    self._addReach(u, v)
                 
         
+
+        def insertEdges(self, edges):
+            for s1, s2 in edges:
+                self.insertEdge(s1, s2)
+
+
         def removeEdge(self, s1,s2):
              u = self._getIndex(s1)
              v = self._getIndex(s2)
@@ -105,6 +183,7 @@ class DirectedGraph:
                 print("Edge not present in the graph")
              else:        
                 self._adj[u][v] = 0
+                self._reach = None
 
 
         def isAdjacent(self, s1, s2):
@@ -146,26 +225,77 @@ class DirectedGraph:
             return ind
 
 
-        def warshalls(self):
-        
-             p = [  [0 for column in range(self._n)]  for row in range(self._n) ]
-           
+        def _closureRows(self):
+             # Row i of the path matrix is kept as a bitset in a Python int,
+             # bit j is set when there is a path from i to j
+             p = [0] * self._n
              for i in range(self._n):
+                row = self._adj[i]
                 for j in range(self._n):
-                     p[i][j] = self._adj[i][j]
-              
+                   if row[j] != 0:
+                      p[i] |= 1 << j
+
+             # If i reaches k then i reaches everything k reaches, so a whole
+             # row is ORed in at once instead of one cell at a time
              for k in range(self._n):
+                bit = 1 << k
+                pk = p[k]
                 for i in range(self._n):
-                   for j in range(self._n):
-                        p[i][j] =  p[i][j] or ( p[i][k] and  p[k][j] )
-                
-           
+                   if p[i] & bit:
+                      p[i] |= pk
+
+             return p
+
+
+        def _addReach(self, u, v):
+             # Every vertex reaching u, and u itself, now reaches v and every
+             # vertex v reaches. This costs O(V) bitset operations per edge
+             # instead of recomputing the closure
+             if (self._reach[u] >> v) & 1:
+                return
+             sources = self._reachedBy[u] | (1 << u)
+             targets = self._reach[v] | (1 << v)
+             for x in _bits(sources):
+                self._reach[x] |= targets
+             for y in _bits(targets):
+                self._reachedBy[y] |= sources
+
+
+        def _closure(self):
+             if not self._incremental:
+                return self._closureRows()
+
+             if self._reach is None:
+                self._reach = self._closureRows()
+                self._reachedBy = [0] * self._n
+                for u in range(self._n):
+                   for v in _bits(self._reach[u]):
+                      self._reachedBy[v] |= 1 << u
+             return self._reach
+
+
+        def transitiveClosure(self):
+             return Reachability(self.vertices(), list(self._closure()))
+
+
+        def reaches(self, s1, s2):
+             u = self._getIndex(s1)
+             v = self._getIndex(s2)
+             if u is None:
+                print("Start vertex not present in the graph")
+                return False
+             elif v is None:
+                print("End vertex not present in the graph")
+                return False
+             return (self._closure()[u] >> v) & 1 == 1
+
+
+        def warshalls(self):
+             p = self.transitiveClosure().pathMatrix()
+
              for i in range(self._n):
                 for j in range(self._n):
-                   if p[i][j] != 0: 
-                      print("1", end =" ")
-                   else:
-                      print("0", end =" ")
+                   print(p[i][j], end =" ")
                 print()
              print()
              
@@ -188,4 +318,14 @@ if __name__ == '__main__':
 
   g1.warshalls()
 
-   
+  r = g1.transitiveClosure()
+  print("Vertices reachable from One :", r.reachableFrom("One"))
+  print("Path from One to Zero :", r.reaches("One", "Zero"))
+
+  g2 = DirectedGraph(incremental=True)
+  g2.insertVertices( ["Zero", "One", "Two", "Three"] )
+  g2.insertEdge("Zero", "One")
+  g2.insertEdge("Two", "Three")
+  print("Path from Zero to Three :", g2.reaches("Zero", "Three"))
+  g2.insertEdge("One", "Two")
+  print("Path from Zero to Three :", g2.reaches("Zero", "Three"))